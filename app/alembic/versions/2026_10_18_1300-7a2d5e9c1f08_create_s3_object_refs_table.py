@@ -0,0 +1,51 @@
+"""create s3 object refs table
+
+Revision ID: 7a2d5e9c1f08
+Revises: 4c1f9a7e2b3d
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7a2d5e9c1f08"
+down_revision: str | None = "4c1f9a7e2b3d"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "s3_object_refs",
+        sa.Column(
+            "key",
+            sa.String(length=1024),
+            nullable=False,
+            comment="Ключ объекта в бакете",
+        ),
+        sa.Column(
+            "refcount",
+            sa.Integer(),
+            server_default="1",
+            nullable=False,
+            comment="Количество ссылок на объект",
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("key", name=op.f("pk_s3_object_refs")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("s3_object_refs")
@@ -0,0 +1,39 @@
+"""add projects hierarchy indexes
+
+Revision ID: 2e8f6b1d4c93
+Revises: 9b4e2c7d6a15
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2e8f6b1d4c93"
+down_revision: str | None = "9b4e2c7d6a15"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        op.f("ix_projects_parent_id"),
+        "projects",
+        ["parent_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_projects_owner_id_deleted_at",
+        "projects",
+        ["owner_id", "deleted_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_projects_owner_id_deleted_at", table_name="projects")
+    op.drop_index(op.f("ix_projects_parent_id"), table_name="projects")
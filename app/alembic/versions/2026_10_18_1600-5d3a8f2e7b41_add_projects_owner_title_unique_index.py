@@ -0,0 +1,76 @@
+"""add projects owner title unique index
+
+Revision ID: 5d3a8f2e7b41
+Revises: 2e8f6b1d4c93
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d3a8f2e7b41"
+down_revision: str | None = "2e8f6b1d4c93"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Дубликаты, созданные до индекса: самый старый проект сохраняет
+    # название, к остальным добавляется суффикс с id
+    op.execute(
+        """
+        UPDATE projects
+        SET title = left(title, 50 - length(' (#' || id || ')')) || ' (#' || id || ')'
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY owner_id, lower(title)
+                    ORDER BY created_at, id
+                ) AS rn
+                FROM projects
+                WHERE deleted_at IS NULL
+            ) AS duplicates
+            WHERE rn > 1
+        )
+        """,
+    )
+    conflicts = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                """
+                SELECT owner_id, lower(title), array_agg(id ORDER BY id)
+                FROM projects
+                WHERE deleted_at IS NULL
+                GROUP BY owner_id, lower(title)
+                HAVING count(*) > 1
+                """,
+            ),
+        )
+        .all()
+    )
+    if conflicts:
+        details = "; ".join(
+            f"owner_id={owner_id} title={title!r} ids={ids}"
+            for owner_id, title, ids in conflicts
+        )
+        message = f"Duplicate project titles left after renaming: {details}"
+        raise RuntimeError(message)
+    op.create_index(
+        "uq_projects_owner_id_lower_title",
+        "projects",
+        ["owner_id", sa.text("lower(title)")],
+        unique=True,
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_projects_owner_id_lower_title", table_name="projects")
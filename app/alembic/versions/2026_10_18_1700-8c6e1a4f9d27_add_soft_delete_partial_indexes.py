@@ -0,0 +1,51 @@
+"""add soft delete partial indexes
+
+Revision ID: 8c6e1a4f9d27
+Revises: 5d3a8f2e7b41
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c6e1a4f9d27"
+down_revision: str | None = "5d3a8f2e7b41"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_projects_owner_id_created_at_not_deleted",
+        "projects",
+        ["owner_id", "created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+    op.create_index(
+        "ix_projects_deleted_at",
+        "projects",
+        ["deleted_at"],
+        unique=False,
+        postgresql_where=sa.text("deleted_at IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_users_deleted_at",
+        "users",
+        ["deleted_at"],
+        unique=False,
+        postgresql_where=sa.text("deleted_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_users_deleted_at", table_name="users")
+    op.drop_index("ix_projects_deleted_at", table_name="projects")
+    op.drop_index("ix_projects_owner_id_created_at_not_deleted", table_name="projects")
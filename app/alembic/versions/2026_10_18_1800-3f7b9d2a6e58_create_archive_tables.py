@@ -0,0 +1,65 @@
+"""create archive tables
+
+Revision ID: 3f7b9d2a6e58
+Revises: 8c6e1a4f9d27
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f7b9d2a6e58"
+down_revision: str | None = "8c6e1a4f9d27"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "project_archives",
+        sa.Column("uuid", sa.Uuid(), nullable=False),
+        sa.Column("title", sa.String(length=50), nullable=False),
+        sa.Column("description", sa.String(length=200), nullable=True),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("parent_id", sa.Integer(), nullable=True),
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_project_archives")),
+    )
+    op.create_table(
+        "user_archives",
+        sa.Column("uuid", sa.Uuid(), nullable=False),
+        sa.Column("first_name", sa.String(length=150), nullable=True),
+        sa.Column("last_name", sa.String(length=150), nullable=True),
+        sa.Column("tg_id", sa.BigInteger(), nullable=True),
+        sa.Column("username", sa.String(length=100), nullable=True),
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_user_archives")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_archives")
+    op.drop_table("project_archives")
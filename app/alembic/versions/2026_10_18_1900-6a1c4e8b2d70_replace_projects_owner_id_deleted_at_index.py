@@ -0,0 +1,36 @@
+"""replace projects owner_id deleted_at index
+
+Revision ID: 6a1c4e8b2d70
+Revises: 3f7b9d2a6e58
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6a1c4e8b2d70"
+down_revision: str | None = "3f7b9d2a6e58"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Выборки живых проектов идут по частичным индексам, по owner_id
+    # без фильтра по deleted_at ищут только проверка FK и архивация
+    # пользователей - им хватает индекса по одному столбцу
+    op.drop_index("ix_projects_owner_id_deleted_at", table_name="projects")
+    op.create_index("ix_projects_owner_id", "projects", ["owner_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_projects_owner_id", table_name="projects")
+    op.create_index(
+        "ix_projects_owner_id_deleted_at",
+        "projects",
+        ["owner_id", "deleted_at"],
+    )
@@ -0,0 +1,33 @@
+"""restore projects owner_id deleted_at index
+
+Revision ID: 9d3b7f1c5e62
+Revises: 6a1c4e8b2d70
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d3b7f1c5e62"
+down_revision: str | None = "6a1c4e8b2d70"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_projects_owner_id_deleted_at",
+        "projects",
+        ["owner_id", "deleted_at"],
+    )
+    op.drop_index("ix_projects_owner_id", table_name="projects")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_projects_owner_id", "projects", ["owner_id"])
+    op.drop_index("ix_projects_owner_id_deleted_at", table_name="projects")
@@ -0,0 +1,48 @@
+"""park failed outbox messages
+
+Revision ID: e4a7c2d9b1f3
+Revises: 9d3b7f1c5e62
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a7c2d9b1f3"
+down_revision: str | None = "9d3b7f1c5e62"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "outbox_messages",
+        sa.Column(
+            "parked_at",
+            sa.DateTime(),
+            nullable=True,
+            comment="Когда отправка остановлена после max_attempts неудач",
+        ),
+    )
+    op.create_index(
+        "ix_outbox_messages_id_not_parked",
+        "outbox_messages",
+        ["id"],
+        postgresql_where=sa.text("parked_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_outbox_messages_id_not_parked",
+        table_name="outbox_messages",
+        postgresql_where=sa.text("parked_at IS NULL"),
+    )
+    op.drop_column("outbox_messages", "parked_at")
@@ -0,0 +1,47 @@
+"""add users photo_keys
+
+Revision ID: 7b3e9f1a4c28
+Revises: e4a7c2d9b1f3
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7b3e9f1a4c28"
+down_revision: str | None = "e4a7c2d9b1f3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column(
+            "photo_keys",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=True,
+            comment="Ключи S3 фото профиля и его производных",
+        ),
+    )
+    op.add_column(
+        "user_archives",
+        sa.Column(
+            "photo_keys",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("user_archives", "photo_keys")
+    op.drop_column("users", "photo_keys")
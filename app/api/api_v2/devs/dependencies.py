@@ -1,20 +1,30 @@
+import asyncio
 import logging
-from io import StringIO
+import shutil
+import tempfile
+from pathlib import Path
 from typing import Annotated
 from typing import Any
 
-import pandas as pd
 from fastapi import File
 from fastapi import HTTPException
 from fastapi import UploadFile
 from fastapi import status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth import jwt_helper
+from config import settings
 from core.crud import GetCRUDService
-from schemas import UserCreateSchema
+from core.crud.services import UserImportService
+from core.crud.services.user_import import UserImportReport
+from core.database import Job
+from misc.job_runner import JobProgress
+from misc.job_runner import job_runner
 
 log = logging.getLogger(__name__)
 
+USERS_CSV_IMPORT_JOB = "users_csv_import"
+
 
 async def create_token_by_user_id(
     user_id: int,
@@ -27,47 +37,86 @@ async def create_token_by_user_id(
     return await jwt_helper.sign_jwt_token(user_id)
 
 
-async def read_and_parse_csv(
+async def import_users_csv_job(
+    session: AsyncSession,
+    payload: dict[str, Any],
+    progress: JobProgress,
+) -> dict[str, Any]:
+    """Обработчик задачи `users_csv_import`: импорт загруженного CSV"""
+    path = Path(payload["path"])
+
+    async def on_progress(report: UserImportReport) -> None:
+        await progress(report.to_dict())
+
+    stream = await asyncio.to_thread(path.open, "rb")
+    try:
+        report = await UserImportService(session).import_csv(
+            stream,
+            on_progress=on_progress,
+        )
+    finally:
+        stream.close()
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+
+    log.info(
+        "CSV import: %d rows, %d inserted, %d skipped, %d failed, %.1f rows/s",
+        report.rows_total,
+        report.inserted,
+        report.skipped,
+        report.failed,
+        report.rows_per_second,
+    )
+    return report.to_dict()
+
+
+job_runner.register(USERS_CSV_IMPORT_JOB, import_users_csv_job)
+
+
+def _save_upload(
+    file: UploadFile,
+) -> Path | None:
+    upload_dir = settings.jobs.upload_dir or tempfile.gettempdir()
+    with tempfile.NamedTemporaryFile(
+        dir=upload_dir,
+        prefix="users-import-",
+        suffix=".csv",
+        delete=False,
+    ) as tmp:
+        shutil.copyfileobj(file.file, tmp)
+        size = tmp.tell()
+
+    path = Path(tmp.name)
+    if not size:
+        path.unlink(missing_ok=True)
+        return None
+    return path
+
+
+async def submit_csv_import(
     file: Annotated[UploadFile, File()],
     crud_service: GetCRUDService,
-) -> None:
+) -> Job:
+    """
+    Сохранить CSV во временный файл и поставить импорт в очередь.
+
+    Файл читает воркер, забравший задачу, поэтому при нескольких
+    хостах `jobs.upload_dir` должен быть общим.
+    """
     if file.filename and not file.filename.endswith(".csv"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Only CSV files are allowed",
         )
-    try:
-        # Read the CSV file
-        content = await file.read()
-        csv_string = StringIO(content.decode("utf-8"))
-        df = pd.read_csv(csv_string)
-
-        # Check if the CSV has the data
-        if df.empty:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="CSV file is empty",
-            )
-
-        # Convert to list of dicts
-        data = df.to_dict(orient="records")
-
-        for user in data:
-            user.pop("id", None)
-            user.pop("created_at", None)
-            user.pop("copmetention", None)
-
-            await crud_service.user.create_or_get_user(
-                user_create=UserCreateSchema.model_validate(user),
-            )
-
-    except pd.errors.EmptyDataError as ed:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="CSV file is empty or invalid",
-        ) from ed
-    except pd.errors.ParserError as pe:
+    path = await asyncio.to_thread(_save_upload, file)
+    if path is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Error parsing CSV file",
-        ) from pe
+            detail="CSV file is empty",
+        )
+
+    job = await crud_service.job.submit(
+        USERS_CSV_IMPORT_JOB,
+        {"path": str(path), "filename": file.filename},
+    )
+    job_runner.notify()
+    return job
@@ -10,9 +10,18 @@ from fastapi.responses import JSONResponse
 
 from auth import jwt_helper
 from config import settings
+from core.cache import user_cache
+from core.crud import GetCRUDService
+from core.database import Job
+from misc.http_client import http_clients
+from misc.image.derivatives import derivative_processor
+from misc.job_runner import job_runner
+from misc.outbox_relay import outbox_relay
+from misc.rabbitmq_broker import guarded_broker
+from misc.soft_delete_archiver import soft_delete_archiver
 
 from .dependencies import create_token_by_user_id
-from .dependencies import read_and_parse_csv
+from .dependencies import submit_csv_import
 
 router = APIRouter()
 
@@ -44,6 +53,62 @@ async def decode_token(
         ) from he
 
 
+@router.get(
+    "/token/cache",
+    include_in_schema=settings.run.dev_mode,
+)
+async def token_cache_stats() -> dict[str, int]:
+    return jwt_helper.token_claims_cache.stats()
+
+
+@router.get(
+    "/cache/users",
+    include_in_schema=settings.run.dev_mode,
+)
+async def user_cache_stats() -> dict[str, float]:
+    return user_cache.stats()
+
+
+@router.get(
+    "/broker/state",
+    include_in_schema=settings.run.dev_mode,
+)
+async def broker_state() -> dict[str, Any]:
+    return guarded_broker.stats()
+
+
+@router.get(
+    "/outbox",
+    include_in_schema=settings.run.dev_mode,
+)
+async def outbox_stats() -> dict[str, int | bool]:
+    return outbox_relay.stats()
+
+
+@router.get(
+    "/http/pool",
+    include_in_schema=settings.run.dev_mode,
+)
+async def http_pool_stats() -> dict[str, dict[str, Any]]:
+    return http_clients.stats()
+
+
+@router.get(
+    "/images/derivatives",
+    include_in_schema=settings.run.dev_mode,
+)
+async def image_derivatives_stats() -> dict[str, int]:
+    return derivative_processor.stats()
+
+
+@router.get(
+    "/archive",
+    include_in_schema=settings.run.dev_mode,
+)
+async def soft_delete_archive_stats() -> dict[str, Any]:
+    return soft_delete_archiver.stats()
+
+
 @router.post(
     "/token/{user_id}",
     include_in_schema=settings.run.dev_mode,
@@ -75,10 +140,50 @@ async def create_token(
 @router.post(
     "/csv_to_db",
     include_in_schema=settings.run.dev_mode,
-    status_code=status.HTTP_201_CREATED,
-    dependencies=[
-        Depends(read_and_parse_csv),
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def temp_upload_csv(
+    job: Annotated[
+        Job,
+        Depends(submit_csv_import),
     ],
+) -> dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "status": job.status,
+    }
+
+
+@router.get(
+    "/jobs",
+    include_in_schema=settings.run.dev_mode,
+)
+async def job_runner_stats() -> dict[str, int | bool]:
+    return job_runner.stats()
+
+
+@router.get(
+    "/jobs/{job_id}",
+    include_in_schema=settings.run.dev_mode,
 )
-async def temp_upload_csv() -> str:
-    return "Upload success"
+async def get_job(
+    job_id: int,
+    crud_service: GetCRUDService,
+) -> dict[str, Any]:
+    job = await crud_service.job.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "progress": job.progress,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
@@ -1,7 +1,14 @@
+from typing import Any
+
 from fastapi import APIRouter
 from starlette import status
 from starlette.responses import JSONResponse
 
+from core.cache import user_cache
+from misc.http_client import http_clients
+from misc.outbox_relay import outbox_relay
+from misc.rabbitmq_broker import guarded_broker
+
 router = APIRouter(
     prefix="/health",
     tags=["health"],
@@ -14,3 +21,14 @@ async def health() -> JSONResponse:
         status_code=status.HTTP_200_OK,
         content={"status": "ok"},
     )
+
+
+@router.get("/metrics")
+async def metrics() -> dict[str, Any]:
+    """Счетчики кэша, брокера, outbox и пула HTTP текущего воркера"""
+    return {
+        "user_cache": user_cache.stats(),
+        "broker": guarded_broker.stats(),
+        "outbox": outbox_relay.stats(),
+        "http_pool": http_clients.stats(),
+    }
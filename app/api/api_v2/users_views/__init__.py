@@ -3,6 +3,7 @@ from fastapi import APIRouter
 from config import settings
 
 from .affirmations_views import router as user_affirmations_router
+from .photo_views import router as user_photo_router
 from .projects_views import router as user_projects_router
 
 router = APIRouter(
@@ -16,3 +17,6 @@ router.include_router(
 router.include_router(
     user_affirmations_router,
 )
+router.include_router(
+    user_photo_router,
+)
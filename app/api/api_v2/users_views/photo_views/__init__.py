@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+
+from .update import router as update_photo_router
+
+router = APIRouter(
+    prefix="/photo",
+    tags=["Photo"],
+)
+
+router.include_router(
+    update_photo_router,
+)
@@ -0,0 +1,70 @@
+from fastapi import HTTPException
+from fastapi import status
+
+from app_exceptions import BaseImageValidationError
+from app_exceptions import FailedToUploadS3FileError
+from app_exceptions import ImageProcessingBusyError
+from auth.current_user import CurrentUser
+from config import settings
+from core.crud import GetCRUDService
+from core.s3 import GetS3Service
+from core.s3.s3_service import S3Service
+from misc.image.pipeline import fetch_validate_upload
+
+from .schemas import UserPhotoReadSchema
+from .schemas import UserPhotoUploadSchema
+
+PHOTO_DIR = "users/photo"
+DEFAULT_PHOTO_URL = "/static/media/nonePhoto.png"
+# Производная для профиля: наименьшая миниатюра в первом формате
+PHOTO_VARIANT = (
+    f"{min(settings.images.thumbnail_sizes)}.{settings.images.derivative_formats[0]}"
+    if settings.images.thumbnail_sizes and settings.images.derivative_formats
+    else "original"
+)
+
+
+def get_photo_url(
+    photo_keys: dict[str, str] | None,
+    s3_service: S3Service,
+) -> str:
+    if not photo_keys:
+        return DEFAULT_PHOTO_URL
+    return s3_service.get_url(photo_keys.get(PHOTO_VARIANT, photo_keys["original"]))
+
+
+async def upload_user_photo(
+    photo: UserPhotoUploadSchema,
+    user: CurrentUser,
+    crud_service: GetCRUDService,
+    s3_service: GetS3Service,
+) -> UserPhotoReadSchema:
+    """
+    Загрузить фото профиля по ссылке вместе с производными.
+
+    Прежнее фото удаляется из S3 после сохранения нового.
+    """
+    try:
+        result = await fetch_validate_upload(
+            str(photo.url),
+            s3_service,
+            target_dir=PHOTO_DIR,
+            with_derivatives=True,
+        )
+    except BaseImageValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e),
+        ) from e
+    except (ImageProcessingBusyError, FailedToUploadS3FileError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Image upload is temporarily unavailable",
+        ) from e
+
+    photo_keys = {"original": result.object_key, **result.derivatives}
+    old_photo_keys = await crud_service.user.set_photo(user, photo_keys)
+    for key in (old_photo_keys or {}).values():
+        await s3_service.delete_file(key)
+
+    return UserPhotoReadSchema(photo_url=get_photo_url(photo_keys, s3_service))
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from pydantic import HttpUrl
+
+
+class UserPhotoUploadSchema(BaseModel):
+    """
+    Ссылка на изображение для фото профиля
+    """
+
+    url: HttpUrl
+
+
+class UserPhotoReadSchema(BaseModel):
+    """
+    Ссылка на миниатюру фото профиля
+    """
+
+    photo_url: str
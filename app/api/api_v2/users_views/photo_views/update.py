@@ -0,0 +1,21 @@
+from typing import Annotated
+
+from fastapi import APIRouter
+from fastapi import Depends
+
+from .dependencies import upload_user_photo
+from .schemas import UserPhotoReadSchema
+
+router = APIRouter()
+
+
+@router.put(
+    "/",
+)
+async def update_user_photo(
+    photo: Annotated[
+        UserPhotoReadSchema,
+        Depends(upload_user_photo),
+    ],
+) -> UserPhotoReadSchema:
+    return photo
@@ -1,14 +1,10 @@
-from typing import Annotated
-
 from fastapi import APIRouter
-from fastapi import Depends
 from fastapi import HTTPException
 from fastapi import status
 
 from app_exceptions import InvalidUUIDError
 from app_exceptions import ProjectAlreadyExistsError
-from app_exceptions import UserNotFoundError
-from auth import jwt_helper
+from auth.current_user import CurrentUser
 from core.crud import GetCRUDService
 from schemas import ProjectCreateSchema
 from schemas import ProjectReadSchema
@@ -22,21 +18,13 @@ router = APIRouter()
 async def create_project(
     crud_service: GetCRUDService,
     project_create: ProjectCreateSchema,
-    user_id: Annotated[
-        str,
-        Depends(jwt_helper.strict_validate_access_token),
-    ],
+    user: CurrentUser,
 ) -> ProjectReadSchema:
     try:
         result = await crud_service.project.create_project(
             project_create=project_create,
-            user_id=int(user_id),
+            user=user,
         )
-    except UserNotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        ) from e
     except InvalidUUIDError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
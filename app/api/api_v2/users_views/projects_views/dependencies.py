@@ -1,45 +1,54 @@
 from typing import Annotated
 
-from fastapi import Depends
 from fastapi import HTTPException
+from fastapi import Query
 from fastapi import status
 
+from app_exceptions import InvalidCursorError
 from app_exceptions import InvalidUUIDError
 from app_exceptions import ProjectNotFoundError
-from app_exceptions import UserNotFoundError
-from auth import jwt_helper
+from auth.current_user import CurrentUser
 from core.crud import GetCRUDService
+from schemas import ProjectPageSchema
 from schemas import ProjectReadSchema
+from schemas import ProjectTreeSchema
+from schemas.projects import PROJECTS_MAX_PAGE_SIZE
+from schemas.projects import PROJECTS_PAGE_SIZE
 
 
 async def get_user_projects(
     crud_service: GetCRUDService,
-    user_id: Annotated[
-        str,
-        Depends(jwt_helper.strict_validate_access_token),
-    ],
-) -> list[ProjectReadSchema]:
+    user: CurrentUser,
+    limit: Annotated[
+        int,
+        Query(ge=1, le=PROJECTS_MAX_PAGE_SIZE, description="Размер страницы"),
+    ] = PROJECTS_PAGE_SIZE,
+    cursor: Annotated[
+        str | None,
+        Query(description="Курсор следующей страницы"),
+    ] = None,
+) -> ProjectPageSchema:
     try:
-        return await crud_service.project.get_all(int(user_id))
-
-    except UserNotFoundError as e:
+        return await crud_service.project.get_all(
+            user,
+            limit=limit,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
         ) from e
 
 
 async def get_project_by_uuid(
     project_uuid: str,
-    user_id: Annotated[
-        str,
-        Depends(jwt_helper.strict_validate_access_token),
-    ],
+    user: CurrentUser,
     crud_service: GetCRUDService,
 ) -> ProjectReadSchema | None:
     try:
         project = await crud_service.project.get_by_uuid(
-            user_id=int(user_id),
+            user=user,
             project_uuid=project_uuid,
         )
     except (ProjectNotFoundError, InvalidUUIDError):
@@ -48,17 +57,48 @@ async def get_project_by_uuid(
         return ProjectReadSchema.model_validate(project)
 
 
+async def get_project_tree(
+    project_uuid: str,
+    user: CurrentUser,
+    crud_service: GetCRUDService,
+) -> ProjectTreeSchema:
+    try:
+        return await crud_service.project.get_tree(
+            user=user,
+            project_uuid=project_uuid,
+        )
+    except (ProjectNotFoundError, InvalidUUIDError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        ) from e
+
+
+async def get_project_ancestors(
+    project_uuid: str,
+    user: CurrentUser,
+    crud_service: GetCRUDService,
+) -> list[ProjectReadSchema]:
+    try:
+        return await crud_service.project.get_ancestors(
+            user=user,
+            project_uuid=project_uuid,
+        )
+    except (ProjectNotFoundError, InvalidUUIDError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        ) from e
+
+
 async def delete_project_by_uuid(
     project_uuid: str,
-    user_id: Annotated[
-        str,
-        Depends(jwt_helper.strict_validate_access_token),
-    ],
+    user: CurrentUser,
     crud_service: GetCRUDService,
 ) -> None:
     try:
         await crud_service.project.delete_project(
-            user_id=int(user_id),
+            user=user,
             project_uuid=project_uuid,
         )
     except ProjectNotFoundError as e:
@@ -3,11 +3,15 @@ from typing import Annotated
 from fastapi import APIRouter
 from fastapi import Depends
 
+from api.api_v2.users_views.projects_views.dependencies import get_project_ancestors
 from api.api_v2.users_views.projects_views.dependencies import get_project_by_uuid
+from api.api_v2.users_views.projects_views.dependencies import get_project_tree
 from api.api_v2.users_views.projects_views.dependencies import get_user_projects
 from config import settings
 from core.database.schemas import ProjectResponseSchema
+from schemas import ProjectPageSchema
 from schemas import ProjectReadSchema
+from schemas import ProjectTreeSchema
 
 router = APIRouter()
 
@@ -31,8 +35,34 @@ async def get_project(
 )
 async def get_projects(
     user_projects: Annotated[
-        list[ProjectReadSchema],
+        ProjectPageSchema,
         Depends(get_user_projects),
     ],
-) -> list[ProjectReadSchema]:
+) -> ProjectPageSchema:
     return user_projects
+
+
+@router.get(
+    "/{project_uuid}/tree",
+    include_in_schema=settings.run.dev_mode,
+)
+async def get_project_tree_view(
+    tree: Annotated[
+        ProjectTreeSchema,
+        Depends(get_project_tree),
+    ],
+) -> ProjectTreeSchema:
+    return tree
+
+
+@router.get(
+    "/{project_uuid}/ancestors",
+    include_in_schema=settings.run.dev_mode,
+)
+async def get_project_ancestors_view(
+    ancestors: Annotated[
+        list[ProjectReadSchema],
+        Depends(get_project_ancestors),
+    ],
+) -> list[ProjectReadSchema]:
+    return ancestors
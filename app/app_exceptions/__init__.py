@@ -1,4 +1,8 @@
 from app_exceptions.exceptions import AuthBaseError as AuthBaseError
+from app_exceptions.exceptions import (
+    BaseImageValidationError as BaseImageValidationError,
+)
+from app_exceptions.exceptions import CircuitBreakerOpenError as CircuitBreakerOpenError
 from app_exceptions.exceptions import (
     FailedToUploadS3FileError as FailedToUploadS3FileError,
 )
@@ -7,7 +11,11 @@ from app_exceptions.exceptions import (
 )
 from app_exceptions.exceptions import ImageFetchError as ImageFetchError
 from app_exceptions.exceptions import ImageFormatError as ImageFormatError
+from app_exceptions.exceptions import (
+    ImageProcessingBusyError as ImageProcessingBusyError,
+)
 from app_exceptions.exceptions import ImageSizeError as ImageSizeError
+from app_exceptions.exceptions import InvalidCursorError as InvalidCursorError
 from app_exceptions.exceptions import InvalidPayloadError as InvalidPayloadError
 from app_exceptions.exceptions import InvalidSignatureError as InvalidSignatureError
 from app_exceptions.exceptions import InvalidUUIDError as InvalidUUIDError
@@ -7,6 +7,9 @@ class UserAlreadyExistsError(Exception): ...
 class InvalidUUIDError(Exception): ...
 
 
+class InvalidCursorError(Exception): ...
+
+
 class ProjectAlreadyExistsError(Exception): ...
 
 
@@ -16,6 +19,9 @@ class ProjectNotFoundError(Exception): ...
 class RabbitMQServiceUnavailableError(Exception): ...
 
 
+class CircuitBreakerOpenError(RabbitMQServiceUnavailableError): ...
+
+
 class FailedToUploadS3FileError(Exception): ...
 
 
@@ -34,6 +40,9 @@ class ImageFormatError(BaseImageValidationError): ...
 class ImageSizeError(BaseImageValidationError): ...
 
 
+class ImageProcessingBusyError(Exception): ...
+
+
 class AuthBaseError(Exception): ...
 
 
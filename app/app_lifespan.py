@@ -4,7 +4,16 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from config import settings
+from core.cache import user_cache
 from core.database.db_helper import db_helper
+from core.s3 import s3_service
+from misc.affirmations_client import affirmations_client
+from misc.http_client import http_clients
+from misc.image.derivatives import derivative_processor
+from misc.job_runner import job_runner
+from misc.outbox_relay import outbox_relay
+from misc.soft_delete_archiver import soft_delete_archiver
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +30,19 @@ async def lifespan(
     :return: None
     """
     logger.info("Start FastAPI")
+    await s3_service.start()
+    outbox_relay.start()
+    job_runner.start()
+    if settings.archive.enabled:
+        soft_delete_archiver.start()
     yield
     logger.info("Stop FastAPI")
+    await soft_delete_archiver.stop()
+    await job_runner.stop()
+    await outbox_relay.stop()
+    await derivative_processor.close()
+    await affirmations_client.close()
+    await s3_service.close()
+    await http_clients.close()
     await db_helper.dispose()
+    await user_cache.close()
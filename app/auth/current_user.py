@@ -0,0 +1,38 @@
+from typing import Annotated
+
+from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import status
+
+from app_exceptions import UserNotFoundError
+from auth import jwt_helper
+from core.crud import GetCRUDService
+from schemas import UserSchema
+
+
+async def get_current_user(
+    crud_service: GetCRUDService,
+    user_id: Annotated[
+        str,
+        Depends(jwt_helper.strict_validate_access_token),
+    ],
+) -> UserSchema:
+    """
+    Пользователь из access-токена.
+
+    FastAPI кэширует зависимость в рамках запроса, поэтому все зависимости
+    и сервисы одного запроса получают одну и ту же загруженную строку.
+    """
+    try:
+        return await crud_service.user.get_by_id(int(user_id))
+    except UserNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        ) from e
+
+
+CurrentUser = Annotated[
+    UserSchema,
+    Depends(get_current_user),
+]
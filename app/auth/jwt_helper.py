@@ -10,14 +10,21 @@ import jwt
 from fastapi import Cookie
 from fastapi import Depends
 from fastapi import HTTPException
+from fastapi import Request
 from fastapi import status
 from jwt import ExpiredSignatureError
 from jwt import InvalidTokenError
 
+from auth.token_cache import TokenClaimsCache
 from config import settings
 
 log = logging.getLogger(__name__)
 
+token_claims_cache = TokenClaimsCache(
+    max_size=settings.access_token.cache_size,
+    ttl=settings.access_token.cache_ttl_seconds,
+)
+
 
 BOT_CONFIG: dict[
     str,
@@ -76,6 +83,10 @@ async def sign_jwt_token(
 async def decode_jwt(
     token: str,
 ) -> dict[str, Any]:
+    cached_claims = token_claims_cache.get(token)
+    if cached_claims is not None:
+        return dict(cached_claims)
+
     try:
         decoded_token = jwt.decode(
             token,
@@ -88,10 +99,7 @@ async def decode_jwt(
         issued_at = int(decoded_token["iat"])
         expires_at = int(decoded_token["exp"])
 
-        log_message = datetime.fromtimestamp(expires_at, tz=UTC).strftime(
-            "%Y-%m-%d %H:%M:%S",
-        )
-        log.info("Token expired at: %s", log_message)
+        log.debug("Token expires at: %d", expires_at)
 
     except ExpiredSignatureError as ex_e:
         raise HTTPException(
@@ -109,16 +117,19 @@ async def decode_jwt(
         ) from e
 
     else:
-        return {
+        claims = {
             "success": True,
             "user_id": user_id,
             "jti": jti,
             "issued_at": issued_at,
             "expires_at": expires_at,
         }
+        token_claims_cache.set(token, dict(claims), expires_at)
+        return claims
 
 
 async def parse_access_token(
+    request: Request,
     access_token: str | None = Cookie(
         default=None,
         alias="access_token",
@@ -126,15 +137,21 @@ async def parse_access_token(
 ) -> int | None:
     if not access_token:
         return None
+
+    memo: tuple[str, int] | None = getattr(request.state, "access_token_user", None)
+    if memo is not None and memo[0] == access_token:
+        return memo[1]
+
     try:
         payload = await decode_jwt(access_token)
         user_id: int = payload["user_id"]
-        log.info("Check access token for user_id: %s", user_id)
+        log.debug("Check access token for user_id: %s", user_id)
 
     except (ExpiredSignatureError, InvalidTokenError):
         log.exception("Error while decoding token")
         return None
     else:
+        request.state.access_token_user = (access_token, user_id)
         return user_id
 
 
@@ -0,0 +1,77 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class TokenClaimsCache:
+    """
+    LRU-кэш проверенных claims access-токенов с TTL.
+
+    Ключ - sha256 от токена, сам токен в памяти не хранится.
+    Запись живет не дольше `ttl` секунд и не дольше `exp` токена.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: int,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(
+        self,
+        token: str,
+    ) -> dict[str, Any] | None:
+        key = self._key(token)
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        valid_until, claims = entry
+        if valid_until <= time.time():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def set(
+        self,
+        token: str,
+        claims: dict[str, Any],
+        expires_at: int,
+    ) -> None:
+        if self.max_size <= 0:
+            return
+
+        key = self._key(token)
+        self._data[key] = (
+            min(time.time() + self.ttl, expires_at),
+            claims,
+        )
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -34,3 +34,6 @@ class PasswordPayload(AuthPayload):
 class AuthStrategy[T: AuthPayload](Protocol):
     async def verify(self, payload: T) -> dict[str, Any]:
         """Return true if signature is valid"""
+
+    def reload_keys(self) -> None:
+        """Recompute cached secrets from current settings"""
@@ -1,7 +1,11 @@
 import hashlib
 import hmac
+from collections.abc import Callable
 from collections.abc import Mapping
 
+from config.auth_bots import AuthBots
+from config.auth_bots import BotsEnum
+
 
 def verify_tg_signature(
     data: Mapping[str, str],
@@ -25,3 +29,13 @@ def verify_tg_signature(
         calculated_hash,
         received_hash,
     )
+
+
+def derive_bots_secret_keys(
+    bots: Mapping[BotsEnum, AuthBots],
+    derive: Callable[[bytes], bytes],
+) -> dict[BotsEnum, bytes]:
+    return {
+        bot_name: derive(bot_config.token.get_secret_value().encode())
+        for bot_name, bot_config in bots.items()
+    }
@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import time
+from typing import Any
+
+import aiohttp
+from jwt import PyJWK
+from jwt import PyJWKSet
+from jwt.exceptions import PyJWKSetError
+
+from app_exceptions import InvalidSignatureError
+from misc.http_client import http_clients
+
+log = logging.getLogger(__name__)
+
+
+class JWKSCache:
+    """
+    Процессный кэш ключей OIDC-провайдера (JWKS) и openid-configuration.
+
+    Ключи хранятся по `kid`. По истечении `ttl` кэш обновляется синхронно,
+    за `refresh_ahead` секунд до истечения - в фоне. Неизвестный `kid`
+    вызывает внеочередное обновление не чаще, чем раз в `min_refetch_interval`.
+    Параллельные обновления объединяются в один запрос. После неудачной
+    попытки следующая начинается не раньше, чем через `retry_interval`,
+    до этого запросы обслуживаются устаревшими ключами. Если ключей
+    еще нет, ошибка загрузки поднимается как `InvalidSignatureError`.
+    """
+
+    TTL = 3600
+    REFRESH_AHEAD = 300
+    MIN_REFETCH_INTERVAL = 30
+    RETRY_INTERVAL = 30
+
+    def __init__(
+        self,
+        oid_server: str,
+        ttl: float = TTL,
+        refresh_ahead: float = REFRESH_AHEAD,
+        min_refetch_interval: float = MIN_REFETCH_INTERVAL,
+        retry_interval: float = RETRY_INTERVAL,
+    ) -> None:
+        self._oid_server = oid_server.rstrip("/")
+        self._jwks_uri = self._oid_server + "/.well-known/jwks.json"
+        self._oid_config_uri = self._oid_server + "/.well-known/openid-configuration"
+
+        self._ttl = ttl
+        self._refresh_ahead = min(refresh_ahead, ttl)
+        self._min_refetch_interval = min_refetch_interval
+        self._retry_interval = retry_interval
+
+        self._keys: dict[str, PyJWK] = {}
+        self._algorithms: list[str] | None = None
+        self._fetched_at: float | None = None
+        self._attempted_at: float | None = None
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    @property
+    def algorithms(self) -> list[str] | None:
+        return self._algorithms
+
+    def _age(self) -> float:
+        if self._fetched_at is None:
+            return float("inf")
+        return time.monotonic() - self._fetched_at
+
+    def _since_attempt(self) -> float:
+        if self._attempted_at is None:
+            return float("inf")
+        return time.monotonic() - self._attempted_at
+
+    def _backing_off(self) -> bool:
+        """Последнее обновление не удалось и `retry_interval` еще не прошел"""
+        if self._attempted_at is None:
+            return False
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return False
+        failed = self._fetched_at is None or self._fetched_at < self._attempted_at
+        return failed and self._since_attempt() < self._retry_interval
+
+    async def get_signing_key(
+        self,
+        kid: str,
+    ) -> PyJWK:
+        age = self._age()
+        if not self._backing_off():
+            if age >= self._ttl:
+                await self.refresh()
+            elif age >= self._ttl - self._refresh_ahead:
+                self._start_refresh()
+
+        key = self._keys.get(kid)
+        if key is None and self._since_attempt() >= self._min_refetch_interval:
+            log.info("Unknown JWKS kid %s, refetching keys", kid)
+            await self.refresh()
+            key = self._keys.get(kid)
+
+        if key is None:
+            error_msg = "Unknown signing key"
+            raise InvalidSignatureError(error_msg)
+        return key
+
+    async def refresh(self) -> None:
+        await asyncio.shield(self._start_refresh())
+
+    def _start_refresh(self) -> asyncio.Task[None]:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._fetch())
+            self._refresh_task.add_done_callback(self._on_refresh_done)
+        return self._refresh_task
+
+    @staticmethod
+    def _on_refresh_done(
+        task: asyncio.Task[None],
+    ) -> None:
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            log.warning("JWKS refresh failed: %r", exc.__cause__ or exc)
+
+    async def _fetch(self) -> None:
+        self._attempted_at = time.monotonic()
+        session = http_clients.get()
+        jwks: dict[str, Any] | BaseException
+        oid_config: dict[str, Any] | BaseException
+        jwks, oid_config = await asyncio.gather(
+            self._fetch_json(session, self._jwks_uri),
+            self._fetch_json(session, self._oid_config_uri),
+            return_exceptions=True,
+        )
+
+        if isinstance(jwks, BaseException):
+            if not self._keys:
+                error_msg = "Signing keys are unavailable"
+                raise InvalidSignatureError(error_msg) from jwks
+            log.warning("Failed to refresh JWKS, serving stale keys: %s", jwks)
+            return
+
+        try:
+            key_set = PyJWKSet.from_dict(jwks)
+        except PyJWKSetError as e:
+            if not self._keys:
+                error_msg = "Signing keys are unavailable"
+                raise InvalidSignatureError(error_msg) from e
+            log.exception("Invalid JWKS document, serving stale keys")
+            return
+
+        self._keys = {key.key_id: key for key in key_set.keys if key.key_id}
+        if isinstance(oid_config, dict):
+            self._algorithms = oid_config.get(
+                "id_token_signing_alg_values_supported",
+            )
+        self._fetched_at = time.monotonic()
+        log.info("JWKS refreshed: %d keys from %s", len(self._keys), self._jwks_uri)
+
+    @staticmethod
+    async def _fetch_json(
+        session: aiohttp.ClientSession,
+        uri: str,
+    ) -> dict[str, Any]:
+        async with session.get(uri) as response:
+            response.raise_for_status()
+            data: dict[str, Any] = await response.json(content_type=None)
+            return data
+
+
+_jwks_caches: dict[str, JWKSCache] = {}
+
+
+def get_jwks_cache(
+    oid_server: str,
+) -> JWKSCache:
+    oid_server = oid_server.rstrip("/")
+    if oid_server not in _jwks_caches:
+        _jwks_caches[oid_server] = JWKSCache(oid_server)
+    return _jwks_caches[oid_server]
@@ -2,6 +2,7 @@ import hashlib
 import hmac
 import json
 import time
+from typing import TYPE_CHECKING
 from typing import Any
 from urllib.parse import parse_qsl
 
@@ -9,13 +10,21 @@ from app_exceptions import InvalidPayloadError
 from app_exceptions import InvalidSignatureError
 from auth.verifiers.base import AuthStrategy
 from auth.verifiers.base import TelegramMiniappPayload
+from auth.verifiers.depends import derive_bots_secret_keys
 from auth.verifiers.depends import verify_tg_signature
 from config import settings
 
+if TYPE_CHECKING:
+    from config.auth_bots import BotsEnum
+
 
 class TelegramMiniAppVerifier(AuthStrategy[TelegramMiniappPayload]):
     AUTH_DATA_EXPIRY = 86400
 
+    def __init__(self) -> None:
+        self._secret_keys: dict[BotsEnum, bytes] = {}
+        self.reload_keys()
+
     @classmethod
     def factory(
         cls,
@@ -23,6 +32,22 @@ class TelegramMiniAppVerifier(AuthStrategy[TelegramMiniappPayload]):
     ) -> "TelegramMiniAppVerifier":
         return cls()
 
+    @staticmethod
+    def derive_secret_key(
+        bot_token: bytes,
+    ) -> bytes:
+        return hmac.new(
+            b"WebAppData",
+            bot_token,
+            hashlib.sha256,
+        ).digest()
+
+    def reload_keys(self) -> None:
+        self._secret_keys = derive_bots_secret_keys(
+            settings.bots,
+            self.derive_secret_key,
+        )
+
     async def verify(
         self,
         payload: TelegramMiniappPayload,
@@ -31,13 +56,11 @@ class TelegramMiniAppVerifier(AuthStrategy[TelegramMiniappPayload]):
             error_msg = "Empty data provided"
             raise InvalidPayloadError(error_msg)
 
-        bot_config = settings.bots.get(payload.bot_name)
-        if not bot_config:
+        secret_key = self._secret_keys.get(payload.bot_name)
+        if not secret_key:
             error_msg = "Invalid bot_name provided"
             raise InvalidPayloadError(error_msg)
 
-        bot_token = str(bot_config.token.get_secret_value())
-
         try:
             pairs = parse_qsl(
                 payload.data,
@@ -54,12 +77,6 @@ class TelegramMiniAppVerifier(AuthStrategy[TelegramMiniappPayload]):
             error_msg = "Authentication data has expired"
             raise InvalidSignatureError(error_msg)
 
-        secret_key = hmac.new(
-            b"WebAppData",
-            bot_token.encode(),
-            hashlib.sha256,
-        ).digest()
-
         is_valid = verify_tg_signature(
             data_dict,
             secret_key,
@@ -1,17 +1,16 @@
-import json
 from typing import Any
 from typing import TypedDict
 
-import aiohttp
 import jwt
+from jwt import DecodeError
 from jwt import ExpiredSignatureError
 from jwt import InvalidIssuerError
-from jwt import PyJWKClient
 from pydantic import HttpUrl
 
 from app_exceptions import InvalidSignatureError
 from auth.verifiers.base import AuthStrategy
 from auth.verifiers.base import TelegramOIDCPayload
+from auth.verifiers.jwks_cache import get_jwks_cache
 from config import settings
 
 
@@ -25,8 +24,7 @@ class TelegramOIDCVerifier(AuthStrategy[TelegramOIDCPayload]):
         oid_server: HttpUrl | str,
     ) -> None:
         self._oid_server = str(oid_server).rstrip("/")
-        self._tg_jwks_uri = self._oid_server + "/.well-known/jwks.json"
-        self._tg_oid_config_uri = self._oid_server + "/.well-known/openid-configuration"
+        self._jwks_cache = get_jwks_cache(self._oid_server)
 
     @classmethod
     def factory(
@@ -50,19 +48,22 @@ class TelegramOIDCVerifier(AuthStrategy[TelegramOIDCPayload]):
             error_msg = "client_id is required"
             raise ValueError(error_msg)
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(self._tg_jwks_uri)
-            oid_specs = json.loads(await response.text())
-            keys_algs = oid_specs.get("id_token_signing_alg_values_supported")
+        try:
+            kid = jwt.get_unverified_header(tg_access_key).get("kid")
+        except DecodeError:
+            error_msg = "JWT token has invalid header"
+            raise InvalidSignatureError(error_msg) from None
+        if not kid:
+            error_msg = "JWT token has no kid"
+            raise InvalidSignatureError(error_msg)
 
-        jwk_client = PyJWKClient(self._tg_jwks_uri)
-        signing_key = jwk_client.get_signing_key_from_jwt(tg_access_key)
+        signing_key = await self._jwks_cache.get_signing_key(kid)
 
         try:
             user_data = jwt.decode(
                 tg_access_key,
                 key=signing_key,
-                algorithms=keys_algs,
+                algorithms=self._jwks_cache.algorithms,
                 audience=client_id,
                 issuer=self._oid_server,
             )
@@ -1,18 +1,27 @@
 import hashlib
 import time
+from typing import TYPE_CHECKING
 from typing import Any
 
 from app_exceptions import InvalidPayloadError
 from app_exceptions import InvalidSignatureError
 from auth.verifiers.base import AuthStrategy
 from auth.verifiers.base import TelegramWidgetPayload
+from auth.verifiers.depends import derive_bots_secret_keys
 from auth.verifiers.depends import verify_tg_signature
 from config import settings
 
+if TYPE_CHECKING:
+    from config.auth_bots import BotsEnum
+
 
 class TelegramWidgetVerifier(AuthStrategy[TelegramWidgetPayload]):
     AUTH_DATA_EXPIRY = 86400
 
+    def __init__(self) -> None:
+        self._secret_keys: dict[BotsEnum, bytes] = {}
+        self.reload_keys()
+
     @classmethod
     def factory(
         cls,
@@ -20,6 +29,20 @@ class TelegramWidgetVerifier(AuthStrategy[TelegramWidgetPayload]):
     ) -> "TelegramWidgetVerifier":
         return cls()
 
+    @staticmethod
+    def derive_secret_key(
+        bot_token: bytes,
+    ) -> bytes:
+        return hashlib.sha256(
+            bot_token,
+        ).digest()
+
+    def reload_keys(self) -> None:
+        self._secret_keys = derive_bots_secret_keys(
+            settings.bots,
+            self.derive_secret_key,
+        )
+
     async def verify(
         self,
         payload: TelegramWidgetPayload,
@@ -28,13 +51,11 @@ class TelegramWidgetVerifier(AuthStrategy[TelegramWidgetPayload]):
             error_msg = "Empty data provided"
             raise InvalidPayloadError(error_msg)
 
-        bot_config = settings.bots.get(payload.bot_name)
-        if not bot_config:
+        secret_key = self._secret_keys.get(payload.bot_name)
+        if not secret_key:
             error_msg = "Invalid bot_name provided"
             raise InvalidPayloadError(error_msg)
 
-        bot_token = str(bot_config.token.get_secret_value())
-
         user_data = payload.data
 
         auth_date = int(user_data.get("auth_date", "0"))
@@ -42,10 +63,6 @@ class TelegramWidgetVerifier(AuthStrategy[TelegramWidgetPayload]):
             error_msg = "Telegram widget data has expired"
             raise InvalidSignatureError(error_msg)
 
-        secret_key = hashlib.sha256(
-            bot_token.encode(),
-        ).digest()
-
         is_valid = verify_tg_signature(
             user_data,
             secret_key,
@@ -19,10 +19,18 @@ type VerifierFactory = Callable[[], AuthStrategy[Any]]
 
 
 class VerifierDispatcher:
+    """
+    Хранит по одному экземпляру верификатора на каждый тип клиента.
+
+    Экземпляры создаются при регистрации и переиспользуются между запросами,
+    поэтому производные секреты ботов считаются один раз.
+    После перезагрузки настроек нужно вызвать `reload_keys`.
+    """
+
     def __init__(self) -> None:
         self._registry: dict[
             ClientType,
-            VerifierFactory,
+            AuthStrategy[Any],
         ] = {}
 
     def register(
@@ -34,9 +42,14 @@ class VerifierDispatcher:
             error_msg = f"Verifier for {auth_schema} already registered"
             raise ValueError(error_msg)
 
-        self._registry[auth_schema] = factory
+        self._registry[auth_schema] = factory()
         log.info("Registered verifier for %s", auth_schema)
 
+    def reload_keys(self) -> None:
+        for auth_schema, verifier in self._registry.items():
+            verifier.reload_keys()
+            log.info("Reloaded verifier keys for %s", auth_schema)
+
     def get(
         self,
         auth_schema: ClientType,
@@ -45,8 +58,7 @@ class VerifierDispatcher:
             error_msg = f"Verifier for {auth_schema} not registered"
             raise UnsupportedClientTypeError(error_msg)
 
-        factory = self._registry[auth_schema]
-        return factory()
+        return self._registry[auth_schema]
 
 
 verifier_dispatcher = VerifierDispatcher()
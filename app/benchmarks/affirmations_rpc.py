@@ -0,0 +1,133 @@
+"""
+Задержка страницы аффирмаций: два `broker.request` подряд против `AffirmationsClient`.
+
+Брокер FastStream работает в памяти (`TestRabbitBroker`), обработчик
+`qry.affirmations` ждет `--latency-ms` на каждый ответ. Тестовый брокер
+не воспроизводит общий lock `broker.request`, а его накладные расходы
+на сообщение растут с `--concurrency`, поэтому выигрыш на живом
+RabbitMQ больше.
+Запуск из каталога `app`: `python -m benchmarks.affirmations_rpc --pages 200`
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections.abc import Awaitable
+from collections.abc import Callable
+from typing import Any
+
+from faststream.rabbit import RabbitBroker
+from faststream.rabbit import TestRabbitBroker
+
+from config import settings
+from misc.affirmations_client import AFFIRMATIONS_QUERY_QUEUE
+from misc.affirmations_client import AffirmationsClient
+from misc.affirmations_client import AffirmationsQuery
+from misc.circuit_breaker import AdaptiveTimeouts
+from misc.circuit_breaker import CircuitBreaker
+from misc.rabbitmq_broker import GuardedBroker
+
+type Page = Callable[[], Awaitable[object]]
+
+PAGE_QUERIES = (
+    AffirmationsQuery("GetPaginatedAffirmations", {"user_tg": 1, "page": 1}),
+    AffirmationsQuery("GetUserSettings", {"user_tg": 1}),
+)
+
+
+def build_broker(latency: float) -> RabbitBroker:
+    broker = RabbitBroker()
+
+    @broker.subscriber(AFFIRMATIONS_QUERY_QUEUE)
+    async def handle_query(message: dict[str, Any]) -> dict[str, Any]:
+        await asyncio.sleep(latency)
+        if message["type"] == "Batch":
+            return {"results": [{"ok": True} for _ in message["payload"]["queries"]]}
+        return {"ok": True}
+
+    return broker
+
+
+def build_pages(
+    broker: RabbitBroker,
+    client: AffirmationsClient,
+) -> dict[str, Page]:
+    async def sequential() -> None:
+        for query in PAGE_QUERIES:
+            response = await broker.request(
+                query.to_message(),
+                queue=AFFIRMATIONS_QUERY_QUEUE,
+            )
+            await response.decode()
+
+    return {
+        "sequential": sequential,
+        "gather": lambda: client.gather(*PAGE_QUERIES),
+        "batch": lambda: client.batch(*PAGE_QUERIES),
+    }
+
+
+async def measure(
+    page: Page,
+    pages: int,
+    concurrency: int,
+) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def load() -> None:
+        async with semaphore:
+            started_at = time.perf_counter()
+            await page()
+            latencies.append((time.perf_counter() - started_at) * 1000)
+
+    await asyncio.gather(*(load() for _ in range(pages)))
+    return latencies
+
+
+async def run(
+    pages: int,
+    concurrency: int,
+    latency: float,
+) -> list[tuple[str, float, float]]:
+    results: list[tuple[str, float, float]] = []
+    async with TestRabbitBroker(build_broker(latency)) as broker:
+        guarded = GuardedBroker(
+            broker=broker,
+            breaker=CircuitBreaker(
+                name="benchmark",
+                failure_threshold=settings.rabbit.breaker.failure_threshold,
+                recovery_seconds=settings.rabbit.breaker.recovery_seconds,
+            ),
+            timeouts=AdaptiveTimeouts(settings.rabbit.breaker),
+        )
+        client = AffirmationsClient(guarded)
+        await client.start()
+        for name, page in build_pages(broker, client).items():
+            # Первые вызовы строят модели сериализации FastStream
+            await measure(page, concurrency, concurrency)
+            latencies = await measure(page, pages, concurrency)
+            percentiles = statistics.quantiles(latencies, n=100)
+            results.append((name, percentiles[49], percentiles[98]))
+        await client.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    sys.stdout.write(f"{'mode':<12}{'p50, ms':>10}{'p99, ms':>10}\n")
+    for name, p50, p99 in asyncio.run(
+        run(args.pages, args.concurrency, args.latency_ms / 1000),
+    ):
+        sys.stdout.write(f"{name:<12}{p50:>10.1f}{p99:>10.1f}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Сравнение пакетных методов `BaseCRUDManager` с циклами по одной строке.
+
+Работает с базой из настроек, все изменения откатываются.
+Запуск из каталога `app`: `python -m benchmarks.crud_bulk --rows 1000`
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from collections.abc import Awaitable
+from collections.abc import Callable
+
+from sqlalchemy import update
+
+from core.crud.managers import ProjectManager
+from core.database import Project
+from core.database import User
+from core.database.db_helper import db_helper
+
+type Step = Callable[[ProjectManager, list[Project]], Awaitable[object]]
+
+
+async def add_loop(manager: ProjectManager, projects: list[Project]) -> None:
+    for project in projects:
+        await manager.add(project)
+        await manager.session.flush([project])
+
+
+async def add_bulk(manager: ProjectManager, projects: list[Project]) -> None:
+    await manager.add_many(projects)
+
+
+async def get_loop(manager: ProjectManager, projects: list[Project]) -> None:
+    ids = [project.id for project in projects]
+    manager.session.expunge_all()
+    for obj_id in ids:
+        await manager.get(obj_id)
+
+
+async def get_bulk(manager: ProjectManager, projects: list[Project]) -> None:
+    ids = [project.id for project in projects]
+    manager.session.expunge_all()
+    await manager.get_many(ids)
+
+
+async def update_loop(manager: ProjectManager, projects: list[Project]) -> None:
+    for project in projects:
+        await manager.session.execute(
+            update(Project).where(Project.id == project.id).values(description="-"),
+        )
+
+
+async def update_bulk(manager: ProjectManager, projects: list[Project]) -> None:
+    await manager.update_many(
+        [project.id for project in projects],
+        {"description": "-"},
+    )
+
+
+async def remove_loop(manager: ProjectManager, projects: list[Project]) -> None:
+    for project in projects:
+        await manager.remove(project.id)
+
+
+async def remove_bulk(manager: ProjectManager, projects: list[Project]) -> None:
+    await manager.remove_many([project.id for project in projects])
+
+
+STEPS: list[tuple[str, Step, Step]] = [
+    ("add", add_loop, add_bulk),
+    ("get", get_loop, get_bulk),
+    ("update", update_loop, update_bulk),
+    ("remove", remove_loop, remove_bulk),
+]
+
+
+async def measure(
+    step: Step,
+    manager: ProjectManager,
+    projects: list[Project],
+) -> float:
+    started_at = time.perf_counter()
+    await step(manager, projects)
+    return (time.perf_counter() - started_at) * 1000
+
+
+async def run(
+    rows: int,
+) -> list[tuple[str, float, float]]:
+    results: list[tuple[str, float, float]] = []
+    async with db_helper.session_factory() as session:
+        manager = ProjectManager(session)
+        owner = User(uuid=uuid.uuid4(), tg_id=-time.time_ns())
+        session.add(owner)
+        await session.flush()
+        owner_id = owner.id
+        looped, bulk = (
+            [
+                Project(uuid=uuid.uuid4(), owner_id=owner_id, title=f"{prefix}-{i}")
+                for i in range(rows)
+            ]
+            for prefix in ("loop", "bulk")
+        )
+        for name, loop_step, bulk_step in STEPS:
+            loop_ms = await measure(loop_step, manager, looped)
+            bulk_ms = await measure(bulk_step, manager, bulk)
+            results.append((name, loop_ms, bulk_ms))
+        await session.rollback()
+    await db_helper.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    sys.stdout.write(
+        f"{'operation':<10}{'loop, ms':>12}{'bulk, ms':>12}{'speedup':>10}\n",
+    )
+    for name, loop_ms, bulk_ms in asyncio.run(run(args.rows)):
+        speedup = loop_ms / bulk_ms
+        sys.stdout.write(
+            f"{name:<10}{loop_ms:>12.1f}{bulk_ms:>12.1f}{speedup:>9.1f}x\n",
+        )
+
+
+if __name__ == "__main__":
+    main()
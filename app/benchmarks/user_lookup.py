@@ -0,0 +1,163 @@
+"""
+Запросов в секунду для `get_by_id` и `get_by_tg_id` до и после кэширования выражений.
+
+"До" - `select()` собирается на каждый вызов, размеры кэшей по умолчанию
+(SQLAlchemy 500, asyncpg 100). "После" - `UserManager` с готовыми
+выражениями и размерами кэшей из `DatabaseConfig`.
+Временные пользователи удаляются в конце.
+Запуск из каталога `app`: `python -m benchmarks.user_lookup --seconds 5`
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from collections.abc import Awaitable
+from collections.abc import Callable
+
+from sqlalchemy import delete
+from sqlalchemy import insert
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from config import settings
+from core.crud.managers import UserManager
+from core.database import User
+from core.database.db_helper import db_helper
+
+type Lookup = Callable[[AsyncSession, int], Awaitable[object]]
+
+# tg_id временных пользователей, чтобы не пересекаться с настоящими
+TG_ID_OFFSET = -(10**15)
+
+
+async def before_by_id(session: AsyncSession, value: int) -> object:
+    stmt = select(User).where(getattr(User, "id") == value)  # noqa: B009
+    return (await session.execute(stmt)).scalar_one_or_none()
+
+
+async def before_by_tg_id(session: AsyncSession, value: int) -> object:
+    stmt = select(User).where(getattr(User, "tg_id") == value)  # noqa: B009
+    return (await session.execute(stmt)).scalar_one_or_none()
+
+
+async def after_by_id(session: AsyncSession, value: int) -> object:
+    return await UserManager(session).get_by_id(value)
+
+
+async def after_by_tg_id(session: AsyncSession, value: int) -> object:
+    return await UserManager(session).get_by_tg_id(value)
+
+
+async def lookup_once(
+    session_factory: async_sessionmaker[AsyncSession],
+    lookup: Lookup,
+    values: list[int],
+) -> None:
+    async with session_factory() as session:
+        await lookup(session, values[0])
+
+
+async def measure(
+    session_factory: async_sessionmaker[AsyncSession],
+    lookup: Lookup,
+    values: list[int],
+    seconds: float,
+    concurrency: int,
+) -> float:
+    # Прогрев: пул соединений и первые компиляции не входят в замер
+    await asyncio.gather(
+        *(lookup_once(session_factory, lookup, values) for _ in range(concurrency)),
+    )
+    deadline = time.perf_counter() + seconds
+    done = 0
+
+    async def worker() -> None:
+        nonlocal done
+        async with session_factory() as session:
+            while time.perf_counter() < deadline:
+                await lookup(session, random.choice(values))  # noqa: S311
+                done += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return done / (time.perf_counter() - started_at)
+
+
+async def run(
+    users: int,
+    seconds: float,
+    concurrency: int,
+) -> list[tuple[str, float, float]]:
+    before_engine = create_async_engine(
+        settings.db.async_url,
+        pool_size=settings.db.pool_size,
+        max_overflow=settings.db.max_overflow,
+    )
+    before_factory = async_sessionmaker(before_engine, expire_on_commit=False)
+    tg_ids = [TG_ID_OFFSET - i for i in range(users)]
+
+    async with db_helper.session_factory() as session:
+        result = await session.execute(
+            insert(User).returning(User.id),
+            [{"uuid": uuid.uuid4(), "tg_id": tg_id} for tg_id in tg_ids],
+        )
+        ids = list(result.scalars())
+        await session.commit()
+
+    lookups: list[tuple[str, Lookup, Lookup, list[int]]] = [
+        ("get_by_id", before_by_id, after_by_id, ids),
+        ("get_by_tg_id", before_by_tg_id, after_by_tg_id, tg_ids),
+    ]
+    results: list[tuple[str, float, float]] = []
+    try:
+        for name, before, after, values in lookups:
+            before_qps = await measure(
+                before_factory,
+                before,
+                values,
+                seconds,
+                concurrency,
+            )
+            after_qps = await measure(
+                db_helper.session_factory,
+                after,
+                values,
+                seconds,
+                concurrency,
+            )
+            results.append((name, before_qps, after_qps))
+    finally:
+        async with db_helper.session_factory() as session:
+            await session.execute(delete(User).where(User.id.in_(ids)))
+            await session.commit()
+        await before_engine.dispose()
+        await db_helper.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    sys.stdout.write(
+        f"{'lookup':<14}{'before, qps':>14}{'after, qps':>14}{'speedup':>10}\n",
+    )
+    for name, before_qps, after_qps in asyncio.run(
+        run(args.users, args.seconds, args.concurrency),
+    ):
+        speedup = after_qps / before_qps
+        sys.stdout.write(
+            f"{name:<14}{before_qps:>14.0f}{after_qps:>14.0f}{speedup:>9.2f}x\n",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class ArchiveConfig(BaseModel):
+    enabled: bool = False
+    retention_days: int = 30
+    batch_size: int = 500
+    interval_seconds: float = 3600
+    batch_pause_seconds: float = 0.1
@@ -0,0 +1,13 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class CacheConfig(BaseModel):
+    backend: Literal["memory", "redis", "none"] = "memory"
+    max_size: int = 10_000
+    ttl_seconds: int = 300
+    redis_url: str | None = None
+    affirmations_fresh_seconds: int = 10
+    affirmations_stale_seconds: int = 300
+    affirmations_max_users: int = 1000
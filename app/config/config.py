@@ -7,9 +7,14 @@ from pydantic_settings import PydanticBaseSettingsSource
 from pydantic_settings import SettingsConfigDict
 from pydantic_settings import YamlConfigSettingsSource
 
+from config.archive import ArchiveConfig
 from config.auth_bots import AuthBots
 from config.auth_bots import BotsEnum
+from config.cache import CacheConfig
 from config.database import DatabaseConfig
+from config.http_client import HttpClientConfig
+from config.images import ImagesConfig
+from config.jobs import JobsConfig
 from config.log import LoggerConfig
 from config.rabbitmq import RabbitMQConfig
 from config.s3 import S3Config
@@ -28,6 +33,8 @@ class AccessToken(BaseModel):
     lifetime_seconds: int
     algorithm: str
     secrets: AccessTokenSecretsConfig
+    cache_size: int = 1024
+    cache_ttl_seconds: int = 300
 
     @property
     def secret(self) -> str:
@@ -109,8 +116,13 @@ class Settings(BaseSettings):
 
     access_token: AccessToken
     api: ApiPrefix
+    archive: ArchiveConfig = ArchiveConfig()
     bots: dict[BotsEnum, AuthBots]
+    cache: CacheConfig = CacheConfig()
     db: DatabaseConfig
+    http: HttpClientConfig = HttpClientConfig()
+    images: ImagesConfig = ImagesConfig()
+    jobs: JobsConfig = JobsConfig()
     log: LoggerConfig
     rabbit: RabbitMQConfig
     uvicorn: UvicornConfig
@@ -16,6 +16,10 @@ class DatabaseConfig(BaseModel):
     max_overflow: int = 10
     pool_timeout: int = 30
     pool_recycle: int = 1800
+    # Кэш скомпилированных запросов SQLAlchemy на engine
+    query_cache_size: int = 1200
+    # Кэш подготовленных выражений asyncpg на соединение
+    prepared_statement_cache_size: int = 500
 
     naming_convention: dict[str, str] = {
         "ix": "ix_%(column_0_label)s",
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class HttpClientConfig(BaseModel):
+    limit: int = 100
+    limit_per_host: int = 10
+    keepalive_timeout: float = 30.0
+    dns_cache_ttl: int = 60
+    connect_timeout: float = 5.0
+    total_timeout: float = 10.0
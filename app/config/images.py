@@ -0,0 +1,11 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class ImagesConfig(BaseModel):
+    derivative_workers: int = 2
+    derivative_queue_size: int = 32
+    thumbnail_sizes: list[int] = [128, 512]
+    derivative_formats: list[Literal["webp", "avif"]] = ["webp"]
+    derivative_quality: int = 80
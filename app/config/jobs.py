@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class JobsConfig(BaseModel):
+    concurrency: int = 1
+    poll_interval_seconds: float = 2.0
+    upload_dir: str | None = None
@@ -9,11 +9,34 @@ class RabbitSecretsConfig(BaseModel):
     password: str
 
 
+class RabbitBreakerConfig(BaseModel):
+    failure_threshold: int = 5
+    recovery_seconds: float = 15.0
+    half_open_max_calls: int = 1
+    default_timeout: float = 3.0
+    min_timeout: float = 0.5
+    max_timeout: float = 3.0
+    timeout_percentile: float = 0.99
+    timeout_multiplier: float = 1.5
+    latency_window: int = 200
+    min_samples: int = 20
+
+
+class RabbitOutboxConfig(BaseModel):
+    batch_size: int = 100
+    poll_interval_seconds: float = 1.0
+    max_backoff_seconds: float = 30.0
+    max_attempts: int = 10
+
+
 class RabbitMQConfig(BaseModel):
     host: str
     port: int
     vhostname: str
     secure: bool = True
+    batch_queries: bool = False
+    breaker: RabbitBreakerConfig = RabbitBreakerConfig()
+    outbox: RabbitOutboxConfig = RabbitOutboxConfig()
     secrets: RabbitSecretsConfig
 
     @computed_field  # type: ignore[prop-decorator]
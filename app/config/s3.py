@@ -6,3 +6,11 @@ class S3Config(BaseModel):
     secret_key: str
     endpoint_url: str
     bucket_name: str
+    max_pool_connections: int = 20
+    keepalive_timeout: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    part_size: int = 8 * 1024 * 1024
+    part_concurrency: int = 4
+    content_addressed: bool = False
+    known_keys_cache_size: int = 10_000
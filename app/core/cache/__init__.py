@@ -0,0 +1,6 @@
+from core.cache.backends import CacheBackend as CacheBackend
+from core.cache.backends import InMemoryLRUBackend as InMemoryLRUBackend
+from core.cache.backends import NullCacheBackend as NullCacheBackend
+from core.cache.backends import RedisCacheBackend as RedisCacheBackend
+from core.cache.user_cache import UserCache as UserCache
+from core.cache.user_cache import user_cache as user_cache
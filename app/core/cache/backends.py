@@ -0,0 +1,127 @@
+import importlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+from typing import Protocol
+
+log = logging.getLogger(__name__)
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> str | None: ...
+
+    async def set(self, key: str, value: str, ttl: int) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class NullCacheBackend:
+    """Бэкенд-заглушка: ничего не хранит, кэш выключен"""
+
+    async def get(self, key: str) -> str | None:  # noqa: ARG002
+        return None
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        pass
+
+    async def delete(self, *keys: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryLRUBackend:
+    """
+    LRU-кэш внутри процесса.
+
+    У каждого воркера свой кэш, инвалидация тоже локальная:
+    устаревание между воркерами ограничено TTL.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+    ) -> None:
+        self.max_size = max_size
+        self._data: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    async def get(self, key: str) -> str | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def close(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisCacheBackend:
+    """
+    Общий для всех воркеров кэш в Redis.
+
+    Пакет `redis` не входит в зависимости проекта
+    и нужен только при `cache.backend: redis`.
+    Ошибки Redis логируются и считаются промахом кэша.
+    """
+
+    def __init__(
+        self,
+        url: str,
+    ) -> None:
+        try:
+            redis_asyncio = importlib.import_module("redis.asyncio")
+        except ImportError as e:
+            error_msg = "Package 'redis' is required for the redis cache backend"
+            raise RuntimeError(error_msg) from e
+
+        self._client: Any = redis_asyncio.from_url(url)
+        self._errors: type[Exception] = redis_asyncio.RedisError
+
+    async def get(self, key: str) -> str | None:
+        try:
+            value: bytes | None = await self._client.get(key)
+        except self._errors:
+            log.exception("Redis cache get failed")
+            return None
+        return value.decode() if value is not None else None
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        try:
+            await self._client.set(key, value, ex=ttl)
+        except self._errors:
+            log.exception("Redis cache set failed")
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self._client.delete(*keys)
+        except self._errors:
+            log.exception("Redis cache delete failed")
+
+    async def close(self) -> None:
+        await self._client.aclose()
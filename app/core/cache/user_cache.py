@@ -0,0 +1,134 @@
+import time
+from typing import Literal
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from config import settings
+from core.cache.backends import CacheBackend
+from core.cache.backends import InMemoryLRUBackend
+from core.cache.backends import NullCacheBackend
+from core.cache.backends import RedisCacheBackend
+from schemas import UserSchema
+
+type UserLookupField = Literal["id", "uuid", "tg_id"]
+
+
+class UserCache:
+    """
+    Read-through кэш профилей пользователей для `UserService`.
+
+    Профиль хранится под ключами id, uuid и tg_id.
+    Отрицательные результаты не кэшируются.
+    """
+
+    KEY_PREFIX = "user"
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl: int,
+    ) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.hit_seconds = 0.0
+        self.miss_seconds = 0.0
+
+    @classmethod
+    def _key(
+        cls,
+        field: UserLookupField,
+        value: int | UUID | str,
+    ) -> str:
+        return f"{cls.KEY_PREFIX}:{field}:{value}"
+
+    @classmethod
+    def _keys_for(
+        cls,
+        user: UserSchema,
+    ) -> list[str]:
+        keys = [
+            cls._key("id", user.id),
+            cls._key("uuid", user.uuid),
+        ]
+        if user.tg_id is not None:
+            keys.append(cls._key("tg_id", user.tg_id))
+        return keys
+
+    async def get(
+        self,
+        field: UserLookupField,
+        value: int | UUID | str,
+    ) -> UserSchema | None:
+        raw = await self.backend.get(self._key(field, value))
+        if raw is None:
+            return None
+        try:
+            return UserSchema.model_validate_json(raw)
+        except ValidationError:
+            await self.backend.delete(self._key(field, value))
+            return None
+
+    async def set(
+        self,
+        user: UserSchema,
+    ) -> None:
+        raw = user.model_dump_json()
+        for key in self._keys_for(user):
+            await self.backend.set(key, raw, self.ttl)
+
+    async def invalidate(
+        self,
+        user: UserSchema,
+    ) -> None:
+        await self.backend.delete(*self._keys_for(user))
+
+    def record(
+        self,
+        *,
+        hit: bool,
+        started_at: float,
+    ) -> None:
+        elapsed = time.perf_counter() - started_at
+        if hit:
+            self.hits += 1
+            self.hit_seconds += elapsed
+        else:
+            self.misses += 1
+            self.miss_seconds += elapsed
+
+    def stats(self) -> dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "avg_hit_ms": self.hit_seconds / self.hits * 1000 if self.hits else 0.0,
+            "avg_miss_ms": (
+                self.miss_seconds / self.misses * 1000 if self.misses else 0.0
+            ),
+        }
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+
+def build_cache_backend() -> CacheBackend:
+    match settings.cache.backend:
+        case "redis":
+            if not settings.cache.redis_url:
+                error_msg = "cache.redis_url is required for the redis cache backend"
+                raise ValueError(error_msg)
+            return RedisCacheBackend(settings.cache.redis_url)
+        case "none":
+            return NullCacheBackend()
+        case _:
+            return InMemoryLRUBackend(settings.cache.max_size)
+
+
+user_cache = UserCache(
+    backend=build_cache_backend(),
+    ttl=settings.cache.ttl_seconds,
+)
@@ -4,7 +4,10 @@ from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.crud.services import JobService
+from core.crud.services import OutboxService
 from core.crud.services import ProjectService
+from core.crud.services import UserImportService
 from core.crud.services import UserService
 from core.database.db_helper import db_helper
 
@@ -16,6 +19,9 @@ class CRUDService:
     ) -> None:
         self.user: UserService = UserService(session)
         self.project: ProjectService = ProjectService(session)
+        self.outbox: OutboxService = OutboxService(session)
+        self.user_import: UserImportService = UserImportService(session)
+        self.job: JobService = JobService(session)
 
 
 async def get_crud_service(
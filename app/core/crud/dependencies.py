@@ -1,5 +1,9 @@
+import base64
+import binascii
+from datetime import datetime
 from uuid import UUID
 
+from app_exceptions import InvalidCursorError
 from app_exceptions import InvalidUUIDError
 
 
@@ -10,3 +14,23 @@ def validate_uuid_str(
         return UUID(project_uuid)
     except ValueError as e:
         raise InvalidUUIDError from e
+
+
+def encode_cursor(
+    created_at: datetime,
+    obj_id: int,
+) -> str:
+    raw = f"{created_at.isoformat()}|{obj_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str,
+) -> tuple[datetime, int]:
+    """Курсор keyset-пагинации: `(created_at, id)` последней записи страницы"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, obj_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(obj_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError from e
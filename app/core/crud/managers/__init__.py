@@ -1,5 +1,8 @@
 from core.crud.managers.base import BaseCRUDManager as BaseCRUDManager
+from core.crud.managers.jobs import JobManager as JobManager
+from core.crud.managers.outbox import OutboxManager as OutboxManager
 from core.crud.managers.projects import ProjectManager as ProjectManager
+from core.crud.managers.s3_object_refs import S3ObjectRefManager as S3ObjectRefManager
 from core.crud.managers.users import UserManager as UserManager
 
 from .base import ModelType as ModelType
@@ -1,6 +1,23 @@
+import copy
 import logging
+from collections.abc import Sequence
+from datetime import UTC
+from datetime import datetime
+from typing import Any
+from typing import Self
 from typing import TypeVar
 
+from sqlalchemy import ColumnElement
+from sqlalchemy import RowMapping
+from sqlalchemy import Select
+from sqlalchemy import any_
+from sqlalchemy import delete
+from sqlalchemy import insert
+from sqlalchemy import inspect
+from sqlalchemy import lambda_stmt
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import array
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database.base import Base
@@ -10,6 +27,14 @@ ModelType = TypeVar("ModelType", bound=Base)
 
 
 class BaseCRUDManager[ModelType]:
+    """
+    Базовый менеджер модели.
+
+    Для моделей с `deleted_at` (`TimestampsMixin`) запросы менеджера
+    по умолчанию не видят мягко удаленные строки. Менеджер без этого
+    ограничения возвращает `with_deleted()`.
+    """
+
     def __init__(
         self,
         session: AsyncSession,
@@ -17,12 +42,132 @@ class BaseCRUDManager[ModelType]:
     ) -> None:
         self.session = session
         self.model = model
+        self.include_deleted = False
+
+    @property
+    def soft_delete(self) -> bool:
+        return hasattr(self.model, "deleted_at")
+
+    def with_deleted(self) -> Self:
+        """Копия менеджера, которая видит и удаленные строки"""
+        manager = copy.copy(self)
+        manager.include_deleted = True
+        return manager
+
+    def not_deleted(
+        self,
+        entity: Any = None,  # noqa: ANN401
+    ) -> list[ColumnElement[bool]]:
+        """Условия скоупа для `entity` (модели или ее алиаса)"""
+        if self.include_deleted or not self.soft_delete:
+            return []
+        target: Any = self.model if entity is None else entity
+        return [target.deleted_at.is_(None)]
+
+    def scoped[T](
+        self,
+        stmt: Select[T],
+    ) -> Select[T]:
+        return stmt.where(*self.not_deleted())
+
+    @property
+    def pk(self) -> Any:  # noqa: ANN401
+        (pk,) = inspect(self.model, raiseerr=True).primary_key
+        return pk
+
+    def _is_visible(
+        self,
+        obj: Any,  # noqa: ANN401
+    ) -> bool:
+        return not self.not_deleted() or obj.deleted_at is None
 
     async def get(
         self,
         obj_id: int,
     ) -> ModelType | None:
-        return await self.session.get(self.model, obj_id)
+        criteria = self.not_deleted()
+        if not criteria:
+            return await self.session.get(self.model, obj_id)
+
+        model: Any = self.model
+        pk = self.pk
+        # lambda_stmt кэширует построение запроса, obj_id уходит в bindparam
+        stmt = lambda_stmt(
+            lambda: select(model).where(pk == obj_id, model.deleted_at.is_(None)),
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_many(
+        self,
+        obj_ids: Sequence[int],
+    ) -> list[ModelType]:
+        """
+        Записи по списку id в порядке `obj_ids` без повторов и ненайденных.
+
+        Объекты, уже загруженные в сессию, берутся из identity map,
+        остальные выбираются одним запросом `id = ANY(...)`.
+        """
+        mapper = inspect(self.model, raiseerr=True)
+        found: dict[int, ModelType] = {}
+        missing: list[int] = []
+        for obj_id in dict.fromkeys(obj_ids):
+            key = mapper.identity_key_from_primary_key((obj_id,))
+            obj = self.session.identity_map.get(key)
+            if obj is None:
+                missing.append(obj_id)
+            elif self._is_visible(obj):
+                found[obj_id] = obj
+
+        if missing:
+            stmt = self.scoped(
+                select(self.model).where(self.pk == any_(array(missing))),
+            )
+            result = await self.session.execute(stmt)
+            pk_attr = mapper.get_property_by_column(self.pk).key
+            for obj in result.scalars():
+                found[getattr(obj, pk_attr)] = obj
+
+        return [found[obj_id] for obj_id in dict.fromkeys(obj_ids) if obj_id in found]
+
+    async def archive_deleted(
+        self,
+        archive_model: type[Base],
+        deleted_before: datetime,
+        batch_size: int,
+        *criteria: ColumnElement[bool],
+    ) -> Sequence[RowMapping]:
+        """
+        Перенести пачку мягко удаленных строк в `archive_model`.
+
+        Один запрос: строки, удаленные раньше `deleted_before`, блокируются
+        `FOR UPDATE SKIP LOCKED`, удаляются и вставляются в архив.
+        `criteria` - дополнительные условия отбора (например, отсутствие
+        ссылок на строку). Возвращает перенесенные строки.
+        """
+        model: Any = self.model
+        columns = [column.name for column in model.__table__.columns]
+        batch = (
+            select(model.id)
+            .where(model.deleted_at < deleted_before, *criteria)
+            .order_by(model.deleted_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("archive_batch")
+        )
+        moved = (
+            delete(model)
+            .where(model.id.in_(select(batch.c.id)))
+            .returning(*(model.__table__.c[name] for name in columns))
+            .cte("archived")
+        )
+        stmt = (
+            insert(archive_model)
+            .from_select(columns, select(*(moved.c[name] for name in columns)))
+            .returning(*(archive_model.__table__.c[name] for name in columns))
+        )
+        result = await self.session.execute(stmt)
+        return result.mappings().all()
 
     async def add(
         self,
@@ -31,8 +176,71 @@ class BaseCRUDManager[ModelType]:
         self.session.add(obj)
         return obj
 
+    async def add_many(
+        self,
+        objs: Sequence[ModelType],
+    ) -> Sequence[ModelType]:
+        """
+        Добавить записи и сразу выполнить flush.
+
+        SQLAlchemy отправляет однотипные INSERT пачкой
+        (insertmanyvalues с RETURNING), после flush у объектов есть id.
+        """
+        self.session.add_all(objs)
+        await self.session.flush(objs)
+        return objs
+
+    async def _execute_returning(
+        self,
+        stmt: Any,  # noqa: ANN401
+    ) -> list[ModelType]:
+        result = await self.session.scalars(
+            stmt.returning(self.model).execution_options(populate_existing=True),
+        )
+        return list(result.all())
+
+    async def update_many(
+        self,
+        obj_ids: Sequence[int],
+        values: dict[str, Any],
+    ) -> list[ModelType]:
+        """Обновить записи одним UPDATE, вернуть обновленные"""
+        if not obj_ids:
+            return []
+        return await self._execute_returning(
+            update(self.model)
+            .where(self.pk == any_(array(list(obj_ids))), *self.not_deleted())
+            .values(**values),
+        )
+
+    async def remove_many(
+        self,
+        obj_ids: Sequence[int],
+    ) -> list[ModelType]:
+        """
+        Удалить записи одним запросом, вернуть удаленные.
+
+        Для моделей с `deleted_at` проставляет время удаления еще
+        не удаленным записям, для остальных выполняет DELETE.
+        """
+        if not obj_ids:
+            return []
+        model: Any = self.model
+        ids = array(list(obj_ids))
+        if not self.soft_delete:
+            return await self._execute_returning(
+                delete(model).where(self.pk == any_(ids)),
+            )
+        return await self._execute_returning(
+            update(model)
+            .where(self.pk == any_(ids), model.deleted_at.is_(None))
+            .values(deleted_at=datetime.now(UTC).replace(tzinfo=None)),
+        )
+
     async def remove(
         self,
         obj_id: int,
-    ) -> None:
-        pass
+    ) -> ModelType | None:
+        """Удалить запись, вернуть ее или `None`, если запись не найдена"""
+        removed = await self.remove_many([obj_id])
+        return removed[0] if removed else None
@@ -0,0 +1,78 @@
+from datetime import UTC
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.crud.managers.base import BaseCRUDManager
+from core.database import Job
+from core.database.jobs import JobStatus
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+class JobManager(BaseCRUDManager[Job]):
+    def __init__(
+        self,
+        session: AsyncSession,
+    ) -> None:
+        super().__init__(
+            session=session,
+            model=Job,
+        )
+
+    async def create(
+        self,
+        kind: str,
+        payload: dict[str, Any],
+    ) -> Job:
+        instance = self.model(kind=kind, payload=payload)
+        self.session.add(instance)
+        return instance
+
+    async def claim_next(self) -> Job | None:
+        """Взять самую старую задачу в очереди и пометить ее запущенной"""
+        stmt = (
+            select(self.model)
+            .where(self.model.status == JobStatus.PENDING)
+            .order_by(self.model.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job = (await self.session.execute(stmt)).scalar_one_or_none()
+        if job is not None:
+            job.status = JobStatus.RUNNING
+            job.started_at = _utcnow()
+        return job
+
+    async def set_progress(
+        self,
+        job_id: int,
+        progress: dict[str, Any],
+    ) -> None:
+        stmt = (
+            update(self.model).where(self.model.id == job_id).values(progress=progress)
+        )
+        await self.session.execute(stmt)
+
+    async def finish(
+        self,
+        job_id: int,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> None:
+        stmt = (
+            update(self.model)
+            .where(self.model.id == job_id)
+            .values(
+                status=JobStatus.FAILED if error is not None else JobStatus.SUCCEEDED,
+                result=result,
+                error=error,
+                finished_at=_utcnow(),
+            )
+        )
+        await self.session.execute(stmt)
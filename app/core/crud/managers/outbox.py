@@ -0,0 +1,86 @@
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import case
+from sqlalchemy import delete
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.crud.managers.base import BaseCRUDManager
+from core.database import OutboxMessage
+
+
+class OutboxManager(BaseCRUDManager[OutboxMessage]):
+    def __init__(
+        self,
+        session: AsyncSession,
+    ) -> None:
+        super().__init__(
+            session=session,
+            model=OutboxMessage,
+        )
+
+    async def enqueue(
+        self,
+        queue: str,
+        message: dict[str, Any],
+    ) -> OutboxMessage:
+        instance = self.model(queue=queue, message=message)
+        self.session.add(instance)
+        return instance
+
+    async def lock_batch(
+        self,
+        limit: int,
+    ) -> Sequence[OutboxMessage]:
+        """
+        Самые старые неотложенные сообщения с блокировкой строк
+        до конца транзакции.
+
+        `SKIP LOCKED` позволяет relay в разных воркерах
+        забирать непересекающиеся пачки.
+        """
+        stmt = (
+            select(self.model)
+            .where(self.model.parked_at.is_(None))
+            .order_by(self.model.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def delete_published(
+        self,
+        obj_ids: Sequence[int],
+    ) -> None:
+        if not obj_ids:
+            return
+        stmt = delete(self.model).where(self.model.id.in_(obj_ids))
+        await self.session.execute(stmt)
+
+    async def mark_failed(
+        self,
+        obj_id: int,
+        max_attempts: int,
+    ) -> bool:
+        """
+        Учесть неудачную попытку отправки.
+
+        После `max_attempts` неудач сообщение откладывается
+        и больше не попадает в `lock_batch`. Возвращает True, если отложено.
+        """
+        attempts = self.model.attempts + 1
+        stmt = (
+            update(self.model)
+            .where(self.model.id == obj_id)
+            .values(
+                attempts=attempts,
+                parked_at=case((attempts >= max_attempts, func.now())),
+            )
+            .returning(self.model.parked_at)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() is not None
@@ -3,16 +3,38 @@ from datetime import UTC
 from datetime import datetime
 from uuid import UUID
 
+from sqlalchemy import RowMapping
+from sqlalchemy import Select
 from sqlalchemy import and_
+from sqlalchemy import bindparam
+from sqlalchemy import exists
 from sqlalchemy import func
+from sqlalchemy import literal
 from sqlalchemy import select
+from sqlalchemy import tuple_
 from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm import joinedload
 
 from core.crud.managers import BaseCRUDManager
+from core.database import APIKey
 from core.database import Project
+from core.database import ProjectArchive
 from schemas import ProjectCreateModel
 
+# Запросы поиска по полю собираются один раз при импорте,
+# значение передается через bindparam
+PROJECT_BY_FIELD = {
+    field: select(Project).where(getattr(Project, field) == bindparam("value"))
+    for field in ("id", "uuid")
+}
+LIVE_PROJECT_BY_FIELD = {
+    field: stmt.where(Project.deleted_at.is_(None))
+    for field, stmt in PROJECT_BY_FIELD.items()
+}
+
 
 class ProjectManager(BaseCRUDManager[Project]):
     def __init__(
@@ -27,10 +49,25 @@ class ProjectManager(BaseCRUDManager[Project]):
     async def create(
         self,
         project_create: ProjectCreateModel,
-    ) -> Project:
-        instance_create = self.model(**project_create.model_dump())
-        self.session.add(instance_create)
-        return instance_create
+    ) -> Project | None:
+        """
+        Создать проект одним `INSERT ... ON CONFLICT DO NOTHING RETURNING`.
+
+        Возвращает `None`, если у владельца уже есть неудаленный проект
+        с таким же названием без учета регистра
+        (индекс `uq_projects_owner_id_lower_title`).
+        """
+        stmt = (
+            insert(self.model)
+            .values(**project_create.model_dump())
+            .on_conflict_do_nothing(
+                index_elements=[self.model.owner_id, func.lower(self.model.title)],
+                index_where=self.model.deleted_at.is_(None),
+            )
+            .returning(self.model)
+        )
+        result = await self.session.scalars(stmt)
+        return result.one_or_none()
 
     async def delete(
         self,
@@ -57,13 +94,8 @@ class ProjectManager(BaseCRUDManager[Project]):
         field: str,
         value: int | UUID,
     ) -> Project | None:
-        stmt = select(self.model).where(
-            and_(
-                getattr(self.model, field) == value,
-                self.model.deleted_at.is_(None),
-            ),
-        )
-        result = await self.session.execute(stmt)
+        statements = PROJECT_BY_FIELD if self.include_deleted else LIVE_PROJECT_BY_FIELD
+        result = await self.session.execute(statements[field], {"value": value})
         return result.scalar_one_or_none()
 
     async def get_by_id(
@@ -78,29 +110,167 @@ class ProjectManager(BaseCRUDManager[Project]):
     ) -> Project | None:
         return await self._get_by("uuid", project_uuid)
 
-    async def get_all(
+    def _page[T](
         self,
+        query: Select[T],
         user_id: int,
-    ) -> Sequence[Project]:
+        limit: int | None,
+        after: tuple[datetime, int] | None,
+    ) -> Select[T]:
         query = (
-            select(self.model)
-            .where(self.model.deleted_at.is_(None))
+            self.scoped(query)
             .where(self.model.owner_id == user_id)
+            .order_by(self.model.created_at, self.model.id)
         )
+        if after is not None:
+            query = query.where(
+                tuple_(self.model.created_at, self.model.id) > tuple_(*after),
+            )
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    async def get_all(
+        self,
+        user_id: int,
+        limit: int | None = None,
+        after: tuple[datetime, int] | None = None,
+        *,
+        with_parent: bool = False,
+    ) -> Sequence[Project]:
+        """
+        Проекты пользователя по возрастанию `(created_at, id)`.
+
+        `after` - ключ последнего проекта предыдущей страницы,
+        родительский проект подгружается только при `with_parent`.
+        """
+        query = self._page(select(self.model), user_id, limit, after)
+        if with_parent:
+            query = query.options(joinedload(self.model.parent))
         result = await self.session.execute(query)
         return result.scalars().all()
 
-    async def get_project_by_field(
+    async def get_all_columns(
         self,
+        user_id: int,
+        columns: Sequence[str],
+        limit: int | None = None,
+        after: tuple[datetime, int] | None = None,
+    ) -> Sequence[RowMapping]:
+        """То же, что `get_all`, но выбирает только колонки `columns`"""
+        query = self._page(
+            select(*(getattr(self.model, column) for column in columns)),
+            user_id,
+            limit,
+            after,
+        )
+        result = await self.session.execute(query)
+        rows: Sequence[RowMapping] = result.mappings().all()
+        return rows
+
+    async def get_subtree(
+        self,
+        project_uuid: UUID,
         owner_id: int,
-        field: str,
-        value: str,
-    ) -> Project | None:
-        model_field = getattr(self.model, field)
-        stmt = select(self.model).where(
-            func.lower(model_field) == value.lower(),
-            self.model.owner_id == owner_id,
-            self.model.deleted_at.is_(None),
+        columns: Sequence[str],
+        max_depth: int,
+    ) -> Sequence[RowMapping]:
+        """
+        Проект и все его потомки одним рекурсивным CTE.
+
+        Строки идут по возрастанию `depth` (у корня 0), поэтому родитель
+        всегда раньше детей. Удаленный проект отсекает свое поддерево.
+        """
+        child = aliased(self.model)
+        tree = (
+            select(
+                *(getattr(self.model, column) for column in columns),
+                literal(0).label("depth"),
+            )
+            .where(
+                self.model.uuid == project_uuid,
+                self.model.owner_id == owner_id,
+                *self.not_deleted(),
+            )
+            .cte("project_subtree", recursive=True)
+        )
+        tree = tree.union_all(
+            select(
+                *(getattr(child, column) for column in columns),
+                tree.c.depth + 1,
+            )
+            .join(tree, child.parent_id == tree.c.id)
+            .where(
+                child.owner_id == owner_id,
+                *self.not_deleted(child),
+                tree.c.depth < max_depth,
+            ),
         )
+        stmt = select(tree).order_by(tree.c.depth, tree.c.created_at, tree.c.id)
         result = await self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        rows: Sequence[RowMapping] = result.mappings().all()
+        return rows
+
+    async def get_ancestors(
+        self,
+        project_uuid: UUID,
+        owner_id: int,
+        columns: Sequence[str],
+        max_depth: int,
+    ) -> Sequence[RowMapping]:
+        """
+        Проект и цепочка его родителей одним рекурсивным CTE.
+
+        `depth` у самого проекта 0, у прямого родителя 1 и т.д.
+        Цепочка обрывается на проекте другого владельца или удаленном.
+        """
+        parent = aliased(self.model)
+        chain = (
+            select(
+                *(getattr(self.model, column) for column in columns),
+                literal(0).label("depth"),
+            )
+            .where(
+                self.model.uuid == project_uuid,
+                self.model.owner_id == owner_id,
+                *self.not_deleted(),
+            )
+            .cte("project_ancestors", recursive=True)
+        )
+        chain = chain.union_all(
+            select(
+                *(getattr(parent, column) for column in columns),
+                chain.c.depth + 1,
+            )
+            .join(chain, parent.id == chain.c.parent_id)
+            .where(
+                parent.owner_id == owner_id,
+                *self.not_deleted(parent),
+                chain.c.depth < max_depth,
+            ),
+        )
+        stmt = select(chain).order_by(chain.c.depth.desc())
+        result = await self.session.execute(stmt)
+        rows: Sequence[RowMapping] = result.mappings().all()
+        return rows
+
+    async def archive_deleted_batch(
+        self,
+        deleted_before: datetime,
+        batch_size: int,
+    ) -> int:
+        """
+        Перенести пачку удаленных проектов в `project_archives`.
+
+        Проекты с подпроектами или API-ключами пропускаются: удаленные
+        подпроекты уходят в архив раньше родителя.
+        """
+        child = aliased(self.model)
+        archived = await self.archive_deleted(
+            ProjectArchive,
+            deleted_before,
+            batch_size,
+            ~exists().where(child.parent_id == self.model.id),
+            ~exists().where(APIKey.project_id == self.model.id),
+        )
+        return len(archived)
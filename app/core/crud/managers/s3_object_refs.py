@@ -0,0 +1,67 @@
+from sqlalchemy import delete
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.crud.managers.base import BaseCRUDManager
+from core.database import S3ObjectRef
+
+
+class S3ObjectRefManager(BaseCRUDManager[S3ObjectRef]):
+    def __init__(
+        self,
+        session: AsyncSession,
+    ) -> None:
+        super().__init__(
+            session=session,
+            model=S3ObjectRef,
+        )
+
+    async def acquire(
+        self,
+        key: str,
+    ) -> int:
+        """Добавить ссылку на объект, вернуть новое число ссылок"""
+        stmt = (
+            insert(self.model)
+            .values(key=key, refcount=1)
+            .on_conflict_do_update(
+                index_elements=[self.model.key],
+                set_={"refcount": self.model.refcount + 1},
+            )
+            .returning(self.model.refcount)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
+
+    async def release(
+        self,
+        key: str,
+    ) -> int | None:
+        """
+        Убрать ссылку на объект, вернуть оставшееся число ссылок.
+
+        Строка с нулем ссылок остается, пока объект не удален из бакета.
+        `None` - объект не учитывается в таблице.
+        """
+        stmt = (
+            update(self.model)
+            .where(self.model.key == key)
+            .values(refcount=self.model.refcount - 1)
+            .returning(self.model.refcount)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def forget(
+        self,
+        key: str,
+    ) -> bool:
+        """Удалить учет объекта, если на него не появились новые ссылки"""
+        stmt = (
+            delete(self.model)
+            .where(self.model.key == key, self.model.refcount <= 0)
+            .returning(self.model.key)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() is not None
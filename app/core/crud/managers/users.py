@@ -1,38 +1,166 @@
+import asyncio
+import logging
+import uuid
+from collections.abc import Iterable
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
+from sqlalchemy import bindparam
+from sqlalchemy import event
+from sqlalchemy import exists
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm import SessionTransaction
 
+from core.cache import UserCache
+from core.cache import user_cache
 from core.crud.managers.base import BaseCRUDManager
+from core.database import Project
 from core.database import User
+from core.database import UserArchive
+from schemas import UserSchema
 from schemas.users import UserCreateModel
 
+log = logging.getLogger(__name__)
+
+# Запросы поиска по полю собираются один раз при импорте,
+# значение передается через bindparam
+USER_BY_FIELD = {
+    field: select(User).where(getattr(User, field) == bindparam("value"))
+    for field in ("id", "uuid", "tg_id")
+}
+LIVE_USER_BY_FIELD = {
+    field: stmt.where(User.deleted_at.is_(None))
+    for field, stmt in USER_BY_FIELD.items()
+}
+
+# Ключ `Session.info` со сбросами кэша, ожидающими коммита
+PENDING_INVALIDATIONS = "user_cache_invalidations"
+_invalidation_tasks: set[asyncio.Task[None]] = set()
+
+
+async def _invalidate_all(
+    pending: list[tuple[UserCache, UserSchema]],
+) -> None:
+    for cache, user in pending:
+        try:
+            await cache.invalidate(user)
+        except Exception:
+            log.exception("Failed to invalidate cached user %s", user.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    pending = session.info.pop(PENDING_INVALIDATIONS, None)
+    if not pending:
+        return
+    task = asyncio.get_running_loop().create_task(_invalidate_all(pending))
+    _invalidation_tasks.add(task)
+    task.add_done_callback(_invalidation_tasks.discard)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_uncommitted(
+    session: Session,
+    transaction: SessionTransaction,
+) -> None:
+    # После отката или закрытия без коммита сбрасывать нечего
+    if transaction.parent is None:
+        session.info.pop(PENDING_INVALIDATIONS, None)
+
 
 class UserManager(BaseCRUDManager[User]):
+    """
+    Менеджер пользователей.
+
+    Методы, которые меняют или удаляют существующие строки, сбрасывают
+    записи `UserCache` по id, uuid и tg_id после коммита транзакции,
+    при откате сброс отменяется. Вставка новых строк кэш
+    не трогает: отрицательные результаты в нем не хранятся.
+    """
+
     def __init__(
         self,
         session: AsyncSession,
+        cache: UserCache = user_cache,
     ) -> None:
         super().__init__(
             session=session,
             model=User,
         )
+        self.cache = cache
+
+    def _invalidate(
+        self,
+        users: Iterable[object],
+    ) -> None:
+        pending = self.session.info.setdefault(PENDING_INVALIDATIONS, [])
+        pending.extend(
+            (self.cache, UserSchema.model_validate(user, from_attributes=True))
+            for user in users
+        )
 
-    async def create(
+    async def create_or_restore(
         self,
         user_create: UserCreateModel,
     ) -> User:
-        instance_create = self.model(**user_create.model_dump())
-        self.session.add(instance_create)
-        return instance_create
+        """
+        Создать пользователя одним `INSERT ... ON CONFLICT (tg_id) DO UPDATE`.
+
+        Если строка с таким tg_id уже есть (в том числе мягко удаленная),
+        с нее снимается `deleted_at` и она возвращается без других изменений.
+        """
+        stmt = (
+            insert(self.model)
+            .values(**user_create.model_dump(), uuid=uuid.uuid4())
+            .on_conflict_do_update(
+                index_elements=[self.model.tg_id],
+                set_={"deleted_at": None},
+            )
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.scalars(stmt)
+        user = result.one()
+        self._invalidate([user])
+        return user
+
+    async def insert_many_ignore_existing(
+        self,
+        users_create: Sequence[UserCreateModel],
+    ) -> int:
+        """
+        Вставить пользователей одним запросом, пропуская занятые tg_id.
+
+        Возвращает количество вставленных строк.
+        """
+        if not users_create:
+            return 0
+        stmt = (
+            insert(self.model)
+            .values(
+                [
+                    {**user_create.model_dump(), "uuid": uuid.uuid4()}
+                    for user_create in users_create
+                ],
+            )
+            .on_conflict_do_nothing(index_elements=[self.model.tg_id])
+            .returning(self.model.id)
+        )
+        result = await self.session.execute(stmt)
+        return len(result.scalars().all())
 
     async def _get_by(
         self,
         field: str,
         value: int | UUID,
     ) -> User | None:
-        stmt = select(self.model).where(getattr(self.model, field) == value)
-        result = await self.session.execute(stmt)
+        statements = USER_BY_FIELD if self.include_deleted else LIVE_USER_BY_FIELD
+        result = await self.session.execute(statements[field], {"value": value})
         return result.scalar_one_or_none()
 
     async def get_by_id(
@@ -52,3 +180,39 @@ class UserManager(BaseCRUDManager[User]):
         user_tg_id: int,
     ) -> User | None:
         return await self._get_by("tg_id", user_tg_id)
+
+    async def update_many(
+        self,
+        obj_ids: Sequence[int],
+        values: dict[str, Any],
+    ) -> list[User]:
+        users = await super().update_many(obj_ids, values)
+        self._invalidate(users)
+        return users
+
+    async def remove_many(
+        self,
+        obj_ids: Sequence[int],
+    ) -> list[User]:
+        users = await super().remove_many(obj_ids)
+        self._invalidate(users)
+        return users
+
+    async def archive_deleted_batch(
+        self,
+        deleted_before: datetime,
+        batch_size: int,
+    ) -> int:
+        """
+        Перенести пачку удаленных пользователей в `user_archives`.
+
+        Пользователи, у которых остались проекты, пропускаются.
+        """
+        archived = await self.archive_deleted(
+            UserArchive,
+            deleted_before,
+            batch_size,
+            ~exists().where(Project.owner_id == self.model.id),
+        )
+        self._invalidate(archived)
+        return len(archived)
@@ -1,2 +1,5 @@
+from core.crud.services.jobs import JobService as JobService
+from core.crud.services.outbox import OutboxService as OutboxService
 from core.crud.services.projects import ProjectService as ProjectService
+from core.crud.services.user_import import UserImportService as UserImportService
 from core.crud.services.users import UserService as UserService
@@ -0,0 +1,31 @@
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.crud.managers import JobManager
+from core.database import Job
+
+
+class JobService:
+    def __init__(
+        self,
+        session: AsyncSession,
+    ) -> None:
+        self.session = session
+        self.manager = JobManager(self.session)
+
+    async def submit(
+        self,
+        kind: str,
+        payload: dict[str, Any],
+    ) -> Job:
+        """Поставить задачу в очередь, выполнит ее `JobRunner`"""
+        instance = await self.manager.create(kind, payload)
+        await self.session.commit()
+        return instance
+
+    async def get(
+        self,
+        job_id: int,
+    ) -> Job | None:
+        return await self.manager.get(job_id)
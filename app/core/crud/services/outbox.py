@@ -0,0 +1,24 @@
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.crud.managers import OutboxManager
+
+
+class OutboxService:
+    def __init__(
+        self,
+        session: AsyncSession,
+    ) -> None:
+        self.session = session
+        self.manager = OutboxManager(self.session)
+
+    async def enqueue(
+        self,
+        queue: str,
+        message: dict[str, Any],
+    ) -> int:
+        """Сохранить команду в outbox, отправит ее `OutboxRelay`"""
+        instance = await self.manager.enqueue(queue, message)
+        await self.session.commit()
+        return instance.id
@@ -1,16 +1,32 @@
+from typing import Any
+
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app_exceptions import ProjectAlreadyExistsError
 from app_exceptions import ProjectNotFoundError
-from app_exceptions import UserNotFoundError
+from core.crud.dependencies import decode_cursor
+from core.crud.dependencies import encode_cursor
 from core.crud.dependencies import validate_uuid_str
 from core.crud.managers import ProjectManager
-from core.crud.managers import UserManager
 from schemas import ProjectCreateModel
 from schemas import ProjectCreateSchema
+from schemas import ProjectPageSchema
 from schemas import ProjectReadSchema
 from schemas import ProjectSchema
+from schemas import ProjectTreeSchema
+from schemas import UserSchema
+from schemas.projects import PROJECT_TREE_MAX_DEPTH
+from schemas.projects import PROJECTS_PAGE_SIZE
+
+PROJECT_READ_COLUMNS = (
+    "id",
+    "uuid",
+    "title",
+    "description",
+    "created_at",
+    "parent_id",
+)
 
 
 class ProjectService:
@@ -20,31 +36,20 @@ class ProjectService:
     ) -> None:
         self.session = session
         self.manager = ProjectManager(self.session)
-        self.user_manager = UserManager(self.session)
 
     async def create_project(
         self,
         project_create: ProjectCreateSchema,
-        user_id: int,
+        user: UserSchema,
     ) -> ProjectReadSchema:
-        user = await self.user_manager.get_by_id(user_id)
-        if not user:
-            raise UserNotFoundError
-
-        project_data = project_create.model_dump()
-        if await self.manager.get_project_by_field(
-            owner_id=user.id,
-            field="title",
-            value=project_data["title"],
-        ):
-            raise ProjectAlreadyExistsError
-
         project_create_model = ProjectCreateModel(
-            **project_data,
+            **project_create.model_dump(),
             owner_id=user.id,
         )
 
         project = await self.manager.create(project_create_model)
+        if project is None:
+            raise ProjectAlreadyExistsError
 
         await self.session.commit()
 
@@ -55,16 +60,12 @@ class ProjectService:
 
     async def get_by_uuid(
         self,
-        user_id: int,
+        user: UserSchema,
         project_uuid: str,
     ) -> ProjectSchema:
 
         # TODO: Добавить проверку, что у пользователь владеет проектом
         project_uuid_validated = validate_uuid_str(project_uuid)
-        user = await self.user_manager.get_by_id(user_id)
-        if not user:
-            raise UserNotFoundError
-
         project = await self.manager.get_by_uuid(project_uuid_validated)
         if not project:
             raise ProjectNotFoundError
@@ -81,32 +82,87 @@ class ProjectService:
 
     async def get_all(
         self,
-        user_id: int,
-    ) -> list[ProjectReadSchema]:
-        user = await self.user_manager.get_by_id(user_id)
-        if not user:
-            raise UserNotFoundError
+        user: UserSchema,
+        limit: int = PROJECTS_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> ProjectPageSchema:
+        rows = await self.manager.get_all_columns(
+            user_id=user.id,
+            columns=PROJECT_READ_COLUMNS,
+            limit=limit + 1,
+            after=decode_cursor(cursor) if cursor else None,
+        )
 
-        projects = await self.manager.get_all(user_id=user.id)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+
+        return ProjectPageSchema(
+            items=[
+                ProjectReadSchema.model_validate(
+                    dict(row),
+                    context={"owner_uuid": user.uuid},
+                )
+                for row in rows
+            ],
+            next_cursor=next_cursor,
+        )
+
+    async def get_tree(
+        self,
+        user: UserSchema,
+        project_uuid: str,
+    ) -> ProjectTreeSchema:
+        """Дерево подпроектов глубиной до `PROJECT_TREE_MAX_DEPTH`"""
+        rows = await self.manager.get_subtree(
+            project_uuid=validate_uuid_str(project_uuid),
+            owner_id=user.id,
+            columns=PROJECT_READ_COLUMNS,
+            max_depth=PROJECT_TREE_MAX_DEPTH,
+        )
+        if not rows:
+            raise ProjectNotFoundError
+
+        nodes: dict[int, dict[str, Any]] = {}
+        for row in rows:
+            node = {**row, "owner_uuid": user.uuid, "children": []}
+            nodes[row["id"]] = node
+            if row["depth"]:
+                nodes[row["parent_id"]]["children"].append(node)
+
+        return ProjectTreeSchema.model_validate(nodes[rows[0]["id"]])
+
+    async def get_ancestors(
+        self,
+        user: UserSchema,
+        project_uuid: str,
+    ) -> list[ProjectReadSchema]:
+        """Родители проекта от корня к прямому родителю"""
+        rows = await self.manager.get_ancestors(
+            project_uuid=validate_uuid_str(project_uuid),
+            owner_id=user.id,
+            columns=PROJECT_READ_COLUMNS,
+            max_depth=PROJECT_TREE_MAX_DEPTH,
+        )
+        if not rows:
+            raise ProjectNotFoundError
 
         return [
             ProjectReadSchema.model_validate(
-                projects,
+                dict(row),
                 context={"owner_uuid": user.uuid},
             )
-            for projects in projects
+            for row in rows
+            if row["depth"]
         ]
 
     async def delete_project(
         self,
-        user_id: int,
+        user: UserSchema,
         project_uuid: str,
     ) -> None:
         project_uuid_validated = validate_uuid_str(project_uuid)
-        user = await self.user_manager.get_by_id(user_id)
-        if not user:
-            raise UserNotFoundError
-
         project = await self.manager.get_by_uuid(project_uuid_validated)
         if not project:
             message = "Project not found"
@@ -0,0 +1,175 @@
+import asyncio
+import csv
+import io
+import itertools
+import time
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Iterator
+from dataclasses import dataclass
+from dataclasses import field
+from typing import IO
+from typing import Any
+
+from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.crud.managers import UserManager
+from schemas.users import UserCreateModel
+
+type ProgressCallback = Callable[["UserImportReport"], Awaitable[None]]
+
+
+@dataclass
+class UserImportRowError:
+    row: int
+    error: str
+
+
+@dataclass
+class UserImportReport:
+    rows_total: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+    errors: list[UserImportRowError] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_total / self.seconds if self.seconds else 0.0
+
+    def add_error(
+        self,
+        row: int,
+        error: str,
+        max_errors: int,
+    ) -> None:
+        self.failed += 1
+        if len(self.errors) < max_errors:
+            self.errors.append(UserImportRowError(row=row, error=error))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rows_total": self.rows_total,
+            "inserted": self.inserted,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": [
+                {"row": error.row, "error": error.error} for error in self.errors
+            ],
+        }
+
+
+class UserImportService:
+    """
+    Потоковый импорт пользователей из CSV.
+
+    Файл читается `csv.DictReader` по `chunk_size` строк, строки
+    проверяются `UserCreateModel`, корректные вставляются одним
+    `INSERT ... ON CONFLICT (tg_id) DO NOTHING` на пачку и коммитятся.
+    Уже существующие tg_id считаются пропущенными, ошибки валидации
+    и БД попадают в отчет с номером строки файла (не больше `max_errors`).
+    """
+
+    CHUNK_SIZE = 1000
+    MAX_ERRORS = 1000
+
+    def __init__(
+        self,
+        session: AsyncSession,
+    ) -> None:
+        self.session = session
+        self.manager = UserManager(self.session)
+
+    @staticmethod
+    def _iter_rows(
+        stream: IO[bytes],
+    ) -> Iterator[tuple[int, dict[str | Any, str | Any]]]:
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+
+    @staticmethod
+    def _normalize(
+        row: dict[str | Any, str | Any],
+    ) -> dict[str, Any]:
+        return {
+            key.strip(): (value.strip() or None) if isinstance(value, str) else value
+            for key, value in row.items()
+            if isinstance(key, str)
+        }
+
+    async def import_csv(
+        self,
+        stream: IO[bytes],
+        chunk_size: int = CHUNK_SIZE,
+        max_errors: int = MAX_ERRORS,
+        on_progress: ProgressCallback | None = None,
+    ) -> UserImportReport:
+        report = UserImportReport()
+        started_at = time.perf_counter()
+        rows = self._iter_rows(stream)
+
+        while True:
+            # Разбор CSV синхронный, пачка читается в потоке
+            chunk = await asyncio.to_thread(
+                list,
+                itertools.islice(rows, chunk_size),
+            )
+            if not chunk:
+                break
+            report.rows_total += len(chunk)
+
+            valid: list[UserCreateModel] = []
+            valid_lines: list[int] = []
+            for line_num, row in chunk:
+                try:
+                    valid.append(UserCreateModel.model_validate(self._normalize(row)))
+                except ValidationError as e:
+                    report.add_error(line_num, self._format_error(e), max_errors)
+                else:
+                    valid_lines.append(line_num)
+
+            await self._insert_chunk(report, valid, valid_lines, max_errors)
+            report.seconds = time.perf_counter() - started_at
+            if on_progress is not None:
+                await on_progress(report)
+
+        report.seconds = time.perf_counter() - started_at
+        return report
+
+    async def _insert_chunk(
+        self,
+        report: UserImportReport,
+        users_create: list[UserCreateModel],
+        lines: list[int],
+        max_errors: int,
+    ) -> None:
+        if not users_create:
+            return
+        try:
+            inserted = await self.manager.insert_many_ignore_existing(users_create)
+            await self.session.commit()
+        except DBAPIError as e:
+            await self.session.rollback()
+            error = f"Database error: {e.orig}"
+            for line_num in lines:
+                report.add_error(line_num, error, max_errors)
+            return
+
+        report.inserted += inserted
+        report.skipped += len(users_create) - inserted
+
+    @staticmethod
+    def _format_error(
+        error: ValidationError,
+    ) -> str:
+        return "; ".join(
+            f"{'.'.join(str(loc) for loc in item['loc'])}: {item['msg']}"
+            for item in error.errors()
+        )
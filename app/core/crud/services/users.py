@@ -1,9 +1,18 @@
+import time
+from collections.abc import Awaitable
+from collections.abc import Callable
+from uuid import UUID
+
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app_exceptions import UserNotFoundError
+from core.cache import UserCache
+from core.cache import user_cache
+from core.cache.user_cache import UserLookupField
 from core.crud.dependencies import validate_uuid_str
 from core.crud.managers import UserManager
+from core.database import User
 from schemas import UserReadSchema
 from schemas import UserSchema
 from schemas.users import UserCreateModel
@@ -14,9 +23,33 @@ class UserService:
     def __init__(
         self,
         session: AsyncSession,
+        cache: UserCache = user_cache,
     ) -> None:
         self.session = session
-        self.manager = UserManager(self.session)
+        self.manager = UserManager(self.session, cache=cache)
+        self.cache = cache
+
+    async def _get_through_cache(
+        self,
+        field: UserLookupField,
+        value: int | UUID,
+        loader: Callable[[], Awaitable[User | None]],
+    ) -> UserSchema:
+        started_at = time.perf_counter()
+        cached_user = await self.cache.get(field, value)
+        if cached_user is not None:
+            self.cache.record(hit=True, started_at=started_at)
+            return cached_user
+
+        try:
+            user = UserSchema.model_validate(await loader())
+        except ValidationError as e:
+            raise UserNotFoundError from e
+        finally:
+            self.cache.record(hit=False, started_at=started_at)
+
+        await self.cache.set(user)
+        return user
 
     async def create_or_get_user(
         self,
@@ -26,11 +59,12 @@ class UserService:
         if user_exists:
             return UserSchema.model_validate(user_exists)
 
+        # Удаленный пользователь с тем же tg_id восстанавливается,
+        # одновременные входы не падают на уникальном индексе
         user_create_model = UserCreateModel.model_validate(user_create)
-        user = await self.manager.create(user_create_model)
+        user = await self.manager.create_or_restore(user_create_model)
 
         await self.session.commit()
-
         return UserSchema.model_validate(user)
 
     async def get_by_id_or_uuid(
@@ -39,20 +73,42 @@ class UserService:
     ) -> UserReadSchema:
         if isinstance(user_id, str):
             user_uuid = validate_uuid_str(user_id)
-            user = await self.manager.get_by_uuid(user_uuid)
+            user = await self._get_through_cache(
+                "uuid",
+                user_uuid,
+                lambda: self.manager.get_by_uuid(user_uuid),
+            )
         else:
-            user = await self.manager.get_by_id(user_id)
-        try:
-            return UserReadSchema.model_validate(user)
-        except ValidationError as e:
-            raise UserNotFoundError from e
+            user = await self.get_by_id(user_id)
+        return UserReadSchema.model_validate(user.model_dump())
+
+    async def get_by_id(
+        self,
+        user_id: int,
+    ) -> UserSchema:
+        return await self._get_through_cache(
+            "id",
+            user_id,
+            lambda: self.manager.get_by_id(user_id),
+        )
 
     async def get_by_tg_id(
         self,
         tg_id: int,
     ) -> UserSchema:
-        user = await self.manager.get_by_tg_id(tg_id)
-        try:
-            return UserSchema.model_validate(user)
-        except ValidationError as e:
-            raise UserNotFoundError from e
+        return await self._get_through_cache(
+            "tg_id",
+            tg_id,
+            lambda: self.manager.get_by_tg_id(tg_id),
+        )
+
+    async def set_photo(
+        self,
+        user: UserSchema,
+        photo_keys: dict[str, str],
+    ) -> dict[str, str] | None:
+        """Сохранить ключи S3 нового фото, вернуть ключи прежнего"""
+        if not await self.manager.update_many([user.id], {"photo_keys": photo_keys}):
+            raise UserNotFoundError
+        await self.session.commit()
+        return user.photo_keys
@@ -1,6 +1,11 @@
+from .archive import ProjectArchive as ProjectArchive
+from .archive import UserArchive as UserArchive
 from .base import Base as Base
+from .jobs import Job as Job
 from .mixins import IntIdMixin as IntIdMixin
 from .mixins import TimestampsMixin as TimestampsMixin
+from .outbox import OutboxMessage as OutboxMessage
 from .projects import Project as Project
+from .s3_object_refs import S3ObjectRef as S3ObjectRef
 from .security.models import APIKey as APIKey
 from .users import User as User
@@ -0,0 +1,44 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import BigInteger
+from sqlalchemy import String
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from .base import Base
+
+
+class ArchivedAtMixin:
+    id: Mapped[int] = mapped_column(
+        primary_key=True,
+        autoincrement=False,
+    )
+    created_at: Mapped[datetime]
+    deleted_at: Mapped[datetime | None]
+    archived_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(),
+    )
+
+
+class ProjectArchive(ArchivedAtMixin, Base):
+    """Удаленные проекты, перенесенные из `projects` после срока хранения"""
+
+    uuid: Mapped[UUID]
+    title: Mapped[str] = mapped_column(String(50))
+    description: Mapped[str | None] = mapped_column(String(200))
+    owner_id: Mapped[int]
+    parent_id: Mapped[int | None]
+
+
+class UserArchive(ArchivedAtMixin, Base):
+    """Удаленные пользователи, перенесенные из `users` после срока хранения"""
+
+    uuid: Mapped[UUID]
+    first_name: Mapped[str | None] = mapped_column(String(150))
+    last_name: Mapped[str | None] = mapped_column(String(150))
+    tg_id: Mapped[int | None] = mapped_column(BigInteger)
+    username: Mapped[str | None] = mapped_column(String(100))
+    photo_keys: Mapped[dict[str, str] | None] = mapped_column(JSONB)
@@ -20,6 +20,9 @@ class DatabaseHelper:
         max_overflow: int = 10,
         pool_timeout: int = 30,
         pool_recycle: int = 1800,  # Пересоздавать соединения каждые 30 минут
+        *,
+        query_cache_size: int,
+        prepared_statement_cache_size: int,
     ) -> None:
         self.engine: AsyncEngine = create_async_engine(
             url=url,
@@ -29,6 +32,10 @@ class DatabaseHelper:
             max_overflow=max_overflow,
             pool_timeout=pool_timeout,
             pool_recycle=pool_recycle,
+            query_cache_size=query_cache_size,
+            connect_args={
+                "prepared_statement_cache_size": prepared_statement_cache_size,
+            },
         )
         self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
             bind=self.engine,
@@ -57,4 +64,6 @@ db_helper = DatabaseHelper(
     max_overflow=settings.db.max_overflow,
     pool_timeout=settings.db.pool_timeout,
     pool_recycle=settings.db.pool_recycle,
+    query_cache_size=settings.db.query_cache_size,
+    prepared_statement_cache_size=settings.db.prepared_statement_cache_size,
 )
@@ -0,0 +1,49 @@
+from datetime import UTC
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Index
+from sqlalchemy import String
+from sqlalchemy import func
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from .base import Base
+from .mixins import IntIdMixin
+
+
+class OutboxMessage(IntIdMixin, Base):
+    __table_args__ = (
+        Index(
+            "ix_outbox_messages_id_not_parked",
+            "id",
+            postgresql_where=text("parked_at IS NULL"),
+        ),
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        default=lambda: datetime.now(UTC).replace(tzinfo=None),
+        server_default=func.now(),
+        nullable=False,
+    )
+    queue: Mapped[str] = mapped_column(
+        String(255),
+        comment="Очередь RabbitMQ",
+    )
+    message: Mapped[dict[str, Any]] = mapped_column(
+        JSONB,
+        comment="Тело команды",
+    )
+    attempts: Mapped[int] = mapped_column(
+        default=0,
+        server_default="0",
+        comment="Неудачных попыток отправки",
+    )
+    parked_at: Mapped[datetime | None] = mapped_column(
+        comment="Когда отправка остановлена после max_attempts неудач",
+    )
+
+    def __repr__(self) -> str:
+        return f"<OutboxMessage(id={self.id}, queue={self.queue})>"
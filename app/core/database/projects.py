@@ -2,7 +2,9 @@ import uuid
 
 from sqlalchemy import UUID
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import String
+from sqlalchemy import text
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
@@ -13,6 +15,33 @@ from core.database.mixins import TimestampsMixin
 
 
 class Project(IntIdMixin, TimestampsMixin, Base):
+    __table_args__ = (
+        Index(
+            "ix_projects_owner_id_deleted_at",
+            "owner_id",
+            "deleted_at",
+        ),
+        Index(
+            "uq_projects_owner_id_lower_title",
+            "owner_id",
+            text("lower(title)"),
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_projects_owner_id_created_at_not_deleted",
+            "owner_id",
+            "created_at",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_projects_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
+
     uuid = mapped_column(
         UUID(as_uuid=True),
         nullable=False,
@@ -28,12 +57,13 @@ class Project(IntIdMixin, TimestampsMixin, Base):
     parent_id: Mapped[int | None] = mapped_column(
         ForeignKey("projects.id"),
         comment="id родительского проекта",
+        index=True,
     )
 
     parent: Mapped["Project"] = relationship(
         "Project",
         remote_side="Project.id",
         backref="subprojects",
-        lazy="joined",
+        lazy="select",
     )
     api_keys = relationship("APIKey", back_populates="project")
@@ -0,0 +1,30 @@
+from datetime import UTC
+from datetime import datetime
+
+from sqlalchemy import String
+from sqlalchemy import func
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from .base import Base
+
+
+class S3ObjectRef(Base):
+    key: Mapped[str] = mapped_column(
+        String(1024),
+        primary_key=True,
+        comment="Ключ объекта в бакете",
+    )
+    refcount: Mapped[int] = mapped_column(
+        default=1,
+        server_default="1",
+        comment="Количество ссылок на объект",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        default=lambda: datetime.now(UTC).replace(tzinfo=None),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<S3ObjectRef(key={self.key}, refcount={self.refcount})>"
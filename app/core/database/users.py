@@ -1,7 +1,10 @@
 import uuid
 
 from sqlalchemy import BigInteger
+from sqlalchemy import Index
 from sqlalchemy import String
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
@@ -12,6 +15,14 @@ from .mixins import TimestampsMixin
 
 
 class User(IntIdMixin, TimestampsMixin, Base):
+    __table_args__ = (
+        Index(
+            "ix_users_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
+
     uuid = mapped_column(
         UUID(as_uuid=True),
         nullable=False,
@@ -39,6 +50,10 @@ class User(IntIdMixin, TimestampsMixin, Base):
         nullable=True,
         comment="Никнейм",
     )
+    photo_keys: Mapped[dict[str, str] | None] = mapped_column(
+        JSONB,
+        comment="Ключи S3 фото профиля и его производных",
+    )
 
     def __repr__(self) -> str:
         return f"<User(id={self.id})>"
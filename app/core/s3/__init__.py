@@ -1,2 +1,3 @@
 from core.s3.s3_service import GetS3Service as GetS3Service
 from core.s3.s3_service import get_s3_service as get_s3_service
+from core.s3.s3_service import s3_service as s3_service
@@ -1,10 +1,18 @@
+import asyncio
+import hashlib
 import logging
 import uuid
+from collections import OrderedDict
 from collections.abc import AsyncGenerator
+from collections.abc import AsyncIterable
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 from typing import Annotated
 
+from aiobotocore.config import AioConfig
 from aiobotocore.session import get_session
 from botocore.exceptions import ClientError
 from fastapi import Depends
@@ -12,9 +20,20 @@ from types_aiobotocore_s3.client import S3Client
 
 from app_exceptions.exceptions import FailedToUploadS3FileError
 from config import settings
+from core.crud.managers import S3ObjectRefManager
+from core.database.db_helper import db_helper
+
+if TYPE_CHECKING:
+    from aiobotocore.session import ClientCreatorContext
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from types_aiobotocore_s3.type_defs import CompletedPartTypeDef
 
 log = logging.getLogger(__name__)
 
+# Минимальный размер части multipart upload в S3 (кроме последней)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
 
 @dataclass
 class S3Config:
@@ -24,12 +43,41 @@ class S3Config:
 
 
 class S3Service:
-    def __init__(
+    """
+    Работа с бакетом S3.
+
+    Клиент aiobotocore создается один раз на воркер в `start`
+    (вызывается из lifespan) и держит пул keep-alive соединений,
+    `close` закрывает его при остановке. До `start` каждый вызов
+    открывает временный клиент.
+
+    `upload_stream` загружает поток частями по `part_size`: объект меньше
+    одной части уходит одним PUT, больший - multipart upload, в котором
+    одновременно загружается не больше `part_concurrency` частей.
+
+    С `content_addressed` ключ объекта строится из SHA-256 содержимого,
+    и повторная загрузка тех же байтов пропускается. Если передан
+    `session_factory`, ссылки на объект считаются в таблице
+    `s3_object_refs`: загрузка добавляет ссылку после того, как объект
+    есть в бакете, `delete_file` убирает ее, а после последней ссылки
+    удаляет и объект. Без подсчета ссылок существование объекта
+    проверяется локальным LRU известных ключей, затем `HEAD`.
+    Multipart-загрузки (больше одной части) всегда получают uuid-ключ.
+    """
+
+    def __init__(  # noqa: PLR0913
         self,
         access_key: str,
         secret_key: str,
         endpoint_url: str,
         bucket_name: str,
+        *,
+        client_config: AioConfig | None = None,
+        part_size: int = 8 * 1024 * 1024,
+        part_concurrency: int = 4,
+        content_addressed: bool = False,
+        known_keys_size: int = 10_000,
+        session_factory: "async_sessionmaker[AsyncSession] | None" = None,
     ) -> None:
         self.config = S3Config(
             aws_access_key_id=access_key,
@@ -37,41 +85,333 @@ class S3Service:
             endpoint_url=endpoint_url,
         )
         self.bucket_name = bucket_name
+        self.client_config = client_config
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.part_concurrency = max(part_concurrency, 1)
+        self.content_addressed = content_addressed
+        self.known_keys_size = known_keys_size
+        self._session_factory = session_factory
+        self._known_keys: OrderedDict[str, None] = OrderedDict()
+        self.dedup_hits = 0
         self.session = get_session()
+        self._client: S3Client | None = None
+        self._exit_stack: AsyncExitStack | None = None
 
-    @asynccontextmanager
-    async def get_client(self) -> AsyncGenerator[S3Client]:
-        async with self.session.create_client(
+    def _create_client(self) -> "ClientCreatorContext[S3Client]":
+        return self.session.create_client(
             "s3",
             aws_access_key_id=self.config.aws_access_key_id,
             aws_secret_access_key=self.config.aws_secret_access_key,
             endpoint_url=self.config.endpoint_url,
-        ) as client:
+            config=self.client_config,
+        )
+
+    async def start(self) -> None:
+        if self._client is not None:
+            return
+        exit_stack = AsyncExitStack()
+        self._client = await exit_stack.enter_async_context(self._create_client())
+        self._exit_stack = exit_stack
+        log.info("S3 client started")
+
+    async def close(self) -> None:
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+        self._exit_stack = None
+        self._client = None
+
+    @asynccontextmanager
+    async def get_client(self) -> AsyncGenerator[S3Client]:
+        if self._client is not None:
+            yield self._client
+            return
+
+        async with self._create_client() as client:
             yield client
 
-    async def upload_file(
-        self,
-        file_bytes: bytes,
-        file_ext: str = "jpg",
-        target_dir: str | None = None,
+    @staticmethod
+    def _make_object_key(
+        file_ext: str,
+        target_dir: str | None,
     ) -> str:
         filename = f"{uuid.uuid4()}.{file_ext.lower()}"
         object_key = f"{target_dir.rstrip('/')}/{filename}" if target_dir else filename
+        return object_key.removeprefix("/")
+
+    @staticmethod
+    def _make_content_key(
+        digest: str,
+        file_ext: str,
+        target_dir: str | None,
+    ) -> str:
+        filename = f"{digest}.{file_ext.lower()}"
+        object_key = f"{target_dir.rstrip('/')}/{filename}" if target_dir else filename
+        return object_key.removeprefix("/")
+
+    def _remember_key(
+        self,
+        object_key: str,
+    ) -> None:
+        self._known_keys[object_key] = None
+        self._known_keys.move_to_end(object_key)
+        while len(self._known_keys) > self.known_keys_size:
+            self._known_keys.popitem(last=False)
+
+    async def _object_exists(
+        self,
+        client: S3Client,
+        object_key: str,
+    ) -> bool:
+        try:
+            await client.head_object(Bucket=self.bucket_name, Key=object_key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in {
+                "404",
+                "NoSuchKey",
+                "NotFound",
+            }:
+                return False
+            raise
+        return True
+
+    async def _change_ref(
+        self,
+        object_key: str,
+        delta: int,
+    ) -> int | None:
+        if self._session_factory is None:
+            return None
+        async with self._session_factory() as session:
+            manager = S3ObjectRefManager(session)
+            refcount: int | None
+            if delta > 0:
+                refcount = await manager.acquire(object_key)
+            else:
+                refcount = await manager.release(object_key)
+            await session.commit()
+        return refcount
 
-        object_key = object_key.removeprefix("/")
+    async def _forget_ref(
+        self,
+        object_key: str,
+    ) -> bool:
+        if self._session_factory is None:
+            return True
+        async with self._session_factory() as session:
+            forgotten = await S3ObjectRefManager(session).forget(object_key)
+            await session.commit()
+        return forgotten
 
+    async def _put_object(
+        self,
+        object_key: str,
+        body: bytes,
+        content_type: str,
+    ) -> None:
         try:
             async with self.get_client() as client:
                 await client.put_object(
                     Bucket=self.bucket_name,
                     Key=object_key,
-                    Body=file_bytes,
+                    Body=body,
+                    ContentType=content_type,
                 )
         except ClientError as e:
             message_error = "Failed to upload file to s3"
             raise FailedToUploadS3FileError(message_error) from e
+
+    async def _upload_content_addressed(
+        self,
+        body: bytes,
+        digest: str,
+        file_ext: str,
+        target_dir: str | None,
+        content_type: str,
+    ) -> str:
+        """
+        Загрузить объект под ключом из хэша, если его еще нет в бакете.
+
+        При подсчете ссылок наличие объекта всегда проверяется `HEAD`,
+        а ссылка добавляется только после этого. Если ссылка оказалась
+        единственной, объект загружается заново: параллельный
+        `delete_file` мог удалить его между проверкой и подсчетом.
+        """
+        object_key = self._make_content_key(digest, file_ext, target_dir)
+        counted = self._session_factory is not None
+        if not counted and object_key in self._known_keys:
+            self._known_keys.move_to_end(object_key)
+            self.dedup_hits += 1
+            return object_key
+
+        try:
+            async with self.get_client() as client:
+                exists = await self._object_exists(client, object_key)
+        except ClientError as e:
+            message_error = "Failed to upload file to s3"
+            raise FailedToUploadS3FileError(message_error) from e
+
+        if not exists:
+            await self._put_object(object_key, body, content_type)
+
+        refcount = await self._change_ref(object_key, 1)
+        if exists and refcount == 1:
+            try:
+                await self._put_object(object_key, body, content_type)
+            except BaseException:
+                await self._change_ref(object_key, -1)
+                raise
+        elif exists:
+            self.dedup_hits += 1
+
+        self._remember_key(object_key)
+        return object_key
+
+    async def upload_file(
+        self,
+        file_bytes: bytes,
+        file_ext: str = "jpg",
+        target_dir: str | None = None,
+        content_type: str = "application/octet-stream",
+    ) -> str:
+        if self.content_addressed:
+            return await self._upload_content_addressed(
+                file_bytes,
+                hashlib.sha256(file_bytes).hexdigest(),
+                file_ext,
+                target_dir,
+                content_type,
+            )
+
+        object_key = self._make_object_key(file_ext, target_dir)
+        await self._put_object(object_key, file_bytes, content_type)
         return object_key
 
+    async def upload_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        file_ext: str = "jpg",
+        target_dir: str | None = None,
+        content_type: str = "application/octet-stream",
+    ) -> str:
+        """
+        Загрузить поток байтов, держа в памяти O(part_size) данных.
+
+        Пока набирается первая часть, поток буферизуется: если он закончился
+        раньше, объект отправляется одним `put_object`. Хэш для
+        `content_addressed` считается по ходу чтения.
+        """
+        object_key = self._make_object_key(file_ext, target_dir)
+        iterator = aiter(chunks)
+        first_part = bytearray()
+        hasher = hashlib.sha256()
+        async for chunk in iterator:
+            first_part += chunk
+            hasher.update(chunk)
+            if len(first_part) >= self.part_size:
+                break
+        else:
+            if self.content_addressed:
+                return await self._upload_content_addressed(
+                    bytes(first_part),
+                    hasher.hexdigest(),
+                    file_ext,
+                    target_dir,
+                    content_type,
+                )
+            await self._put_object(object_key, bytes(first_part), content_type)
+            return object_key
+
+        try:
+            await self._upload_multipart(
+                object_key,
+                self._iter_parts(first_part, iterator),
+                content_type,
+            )
+        except ClientError as e:
+            message_error = "Failed to upload file to s3"
+            raise FailedToUploadS3FileError(message_error) from e
+        return object_key
+
+    async def _iter_parts(
+        self,
+        buffer: bytearray,
+        chunks: AsyncIterator[bytes],
+    ) -> AsyncGenerator[bytes]:
+        while len(buffer) >= self.part_size:
+            yield bytes(buffer[: self.part_size])
+            del buffer[: self.part_size]
+        async for chunk in chunks:
+            buffer += chunk
+            while len(buffer) >= self.part_size:
+                yield bytes(buffer[: self.part_size])
+                del buffer[: self.part_size]
+        if buffer:
+            yield bytes(buffer)
+
+    async def _upload_multipart(
+        self,
+        object_key: str,
+        parts: AsyncIterator[bytes],
+        content_type: str,
+    ) -> None:
+        async with self.get_client() as client:
+            upload = await client.create_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=object_key,
+                ContentType=content_type,
+            )
+            upload_id = upload["UploadId"]
+
+            async def upload_part(
+                part_number: int,
+                body: bytes,
+            ) -> "CompletedPartTypeDef":
+                response = await client.upload_part(
+                    Bucket=self.bucket_name,
+                    Key=object_key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                )
+                return {"ETag": response["ETag"], "PartNumber": part_number}
+
+            pending: set[asyncio.Task[CompletedPartTypeDef]] = set()
+            completed: list[CompletedPartTypeDef] = []
+            try:
+                part_number = 0
+                async for body in parts:
+                    if len(pending) >= self.part_concurrency:
+                        done, pending = await asyncio.wait(
+                            pending,
+                            return_when=asyncio.FIRST_COMPLETED,
+                        )
+                        completed.extend(task.result() for task in done)
+                    part_number += 1
+                    pending.add(asyncio.create_task(upload_part(part_number, body)))
+
+                completed.extend(await asyncio.gather(*pending))
+                pending = set()
+                completed.sort(key=lambda part: part["PartNumber"])
+                await client.complete_multipart_upload(
+                    Bucket=self.bucket_name,
+                    Key=object_key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": completed},
+                )
+            except BaseException:
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                try:
+                    await client.abort_multipart_upload(
+                        Bucket=self.bucket_name,
+                        Key=object_key,
+                        UploadId=upload_id,
+                    )
+                except ClientError:
+                    log.exception("Failed to abort multipart upload %s", upload_id)
+                raise
+
     def get_url(
         self,
         object_name: str,
@@ -84,6 +424,30 @@ class S3Service:
     async def delete_file(
         self,
         object_name: str,
+    ) -> bool:
+        """
+        Удалить объект или ссылку на него.
+
+        Если на объект есть другие ссылки, удаляется только ссылка.
+        Уменьшение счетчика фиксируется до запроса к S3, строка с нулем
+        ссылок удаляется после объекта. Загрузка тех же байтов в это время
+        получит единственную ссылку и загрузит объект заново.
+        """
+        self._known_keys.pop(object_name, None)
+        refcount = await self._change_ref(object_name, -1)
+        if refcount is not None and refcount > 0:
+            return True
+
+        deleted = await self._delete_object(object_name)
+        if not deleted or refcount is None:
+            return deleted
+        if not await self._forget_ref(object_name):
+            log.warning("Object %s was referenced again during delete", object_name)
+        return deleted
+
+    async def _delete_object(
+        self,
+        object_name: str,
     ) -> bool:
         try:
             async with self.get_client() as client:
@@ -98,13 +462,30 @@ class S3Service:
         return True
 
 
+s3_service = S3Service(
+    access_key=settings.s3.access_key,
+    secret_key=settings.s3.secret_key,
+    endpoint_url=settings.s3.endpoint_url,
+    bucket_name=settings.s3.bucket_name,
+    part_size=settings.s3.part_size,
+    part_concurrency=settings.s3.part_concurrency,
+    content_addressed=settings.s3.content_addressed,
+    known_keys_size=settings.s3.known_keys_cache_size,
+    session_factory=(
+        db_helper.session_factory if settings.s3.content_addressed else None
+    ),
+    client_config=AioConfig(
+        max_pool_connections=settings.s3.max_pool_connections,
+        connect_timeout=settings.s3.connect_timeout,
+        read_timeout=settings.s3.read_timeout,
+        tcp_keepalive=True,
+        connector_args={"keepalive_timeout": settings.s3.keepalive_timeout},
+    ),
+)
+
+
 async def get_s3_service() -> S3Service:
-    return S3Service(
-        access_key=settings.s3.access_key,
-        secret_key=settings.s3.secret_key,
-        endpoint_url=settings.s3.endpoint_url,
-        bucket_name=settings.s3.bucket_name,
-    )
+    return s3_service
 
 
 GetS3Service = Annotated[
@@ -0,0 +1,205 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from app_exceptions import CircuitBreakerOpenError
+from config import settings
+from misc.affirmations_client import AffirmationsQuery
+from misc.rabbitmq_broker import BROKER_ERRORS
+
+log = logging.getLogger(__name__)
+
+type FetchMany = Callable[
+    [Sequence[AffirmationsQuery]],
+    Awaitable[list[dict[str, Any]]],
+]
+type FetchOne = Callable[[AffirmationsQuery], Awaitable[dict[str, Any]]]
+
+
+@dataclass
+class _Entry:
+    value: dict[str, Any]
+    fetched_at: float
+
+
+class AffirmationsResponseCache:
+    """
+    Кэш ответов `qry.affirmations` со stale-while-revalidate.
+
+    Свежая запись (моложе `fresh_ttl`) отдается как есть. Устаревшая,
+    но моложе `stale_ttl`, отдается сразу, а в фоне запускается обновление.
+    Более старая запись запрашивается заново, но если брокер недоступен,
+    отдается любая сохраненная запись. Записи хранятся по `user_tg`
+    и сбрасываются через `invalidate` после отправки команд пользователя.
+
+    Кэш локален для воркера: после команды, отправленной другим воркером,
+    старые данные отдаются до ближайшего обновления записи.
+
+    `hold` на время до отправки команды пользователя запрещает кэшировать
+    его ответы, `invalidate` снимает запрет. Ответ, запрошенный до
+    `invalidate`, не сохраняется. Время сброса
+    хранится только `stale_ttl` секунд: запрос к брокеру ограничен
+    таймаутом и за это время гарантированно завершается.
+    """
+
+    def __init__(
+        self,
+        fresh_ttl: float,
+        stale_ttl: float,
+        max_users: int,
+    ) -> None:
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = max(stale_ttl, fresh_ttl)
+        self.max_users = max_users
+        self._users: OrderedDict[int, dict[str, _Entry]] = OrderedDict()
+        self._invalidated_at: OrderedDict[int, float] = OrderedDict()
+        self._refreshing: dict[tuple[int, str], asyncio.Task[None]] = {}
+
+    @staticmethod
+    def _user_tg(query: AffirmationsQuery) -> int:
+        return int(query.payload["user_tg"])
+
+    @staticmethod
+    def _key(query: AffirmationsQuery) -> str:
+        return json.dumps(
+            [query.type, query.payload],
+            sort_keys=True,
+            default=str,
+        )
+
+    def _lookup(self, query: AffirmationsQuery) -> _Entry | None:
+        user_tg = self._user_tg(query)
+        entries = self._users.get(user_tg)
+        if entries is None:
+            return None
+        self._users.move_to_end(user_tg)
+        return entries.get(self._key(query))
+
+    def _store(
+        self,
+        query: AffirmationsQuery,
+        value: dict[str, Any],
+        requested_at: float,
+    ) -> None:
+        user_tg = self._user_tg(query)
+        invalidated_at = self._invalidated_at.get(user_tg)
+        if invalidated_at is not None and invalidated_at >= requested_at:
+            return
+
+        entries = self._users.setdefault(user_tg, {})
+        entries[self._key(query)] = _Entry(value=value, fetched_at=time.monotonic())
+        self._users.move_to_end(user_tg)
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+
+    def _mark(self, user_tg: int, until: float) -> None:
+        now = time.monotonic()
+        self._users.pop(user_tg, None)
+        self._invalidated_at[user_tg] = until
+        self._invalidated_at.move_to_end(user_tg)
+        while self._invalidated_at:
+            _, oldest = next(iter(self._invalidated_at.items()))
+            if now - oldest < self.stale_ttl:
+                break
+            self._invalidated_at.popitem(last=False)
+
+    def invalidate(self, user_tg: int) -> None:
+        self._mark(user_tg, time.monotonic())
+
+    def hold(self, user_tg: int) -> None:
+        """
+        Не кэшировать ответы пользователя, пока его команда в outbox.
+
+        Запрет снимается через `invalidate` после отправки команды,
+        но не дольше чем через `stale_ttl`.
+        """
+        self._mark(user_tg, time.monotonic() + self.stale_ttl)
+
+    def _refresh_in_background(
+        self,
+        query: AffirmationsQuery,
+        fetch_one: FetchOne,
+    ) -> None:
+        task_key = (self._user_tg(query), self._key(query))
+        if task_key in self._refreshing:
+            return
+
+        requested_at = time.monotonic()
+
+        async def _refresh() -> None:
+            self._store(query, await fetch_one(query), requested_at)
+
+        task = asyncio.create_task(_refresh())
+        self._refreshing[task_key] = task
+        task.add_done_callback(lambda t: self._on_refresh_done(task_key, t))
+
+    def _on_refresh_done(
+        self,
+        task_key: tuple[int, str],
+        task: asyncio.Task[None],
+    ) -> None:
+        self._refreshing.pop(task_key, None)
+        if not task.cancelled() and task.exception() is not None:
+            log.warning("Affirmations cache refresh failed: %r", task.exception())
+
+    async def get_many(
+        self,
+        queries: Sequence[AffirmationsQuery],
+        fetch_many: FetchMany,
+        fetch_one: FetchOne,
+    ) -> list[dict[str, Any]]:
+        now = time.monotonic()
+        entries = [self._lookup(query) for query in queries]
+
+        missing: list[int] = []
+        for idx, entry in enumerate(entries):
+            if entry is None or now - entry.fetched_at >= self.stale_ttl:
+                missing.append(idx)
+            elif now - entry.fetched_at >= self.fresh_ttl:
+                self._refresh_in_background(queries[idx], fetch_one)
+
+        results = [entry.value if entry else {} for entry in entries]
+        if not missing:
+            return results
+
+        missing_queries = [queries[idx] for idx in missing]
+        requested_at = time.monotonic()
+        try:
+            fetched = await fetch_many(missing_queries)
+        except (*BROKER_ERRORS, CircuitBreakerOpenError):
+            if any(entries[idx] is None for idx in missing):
+                raise
+            log.warning("Affirmations service unavailable, serving stale responses")
+            return results
+
+        for idx, query, value in zip(missing, missing_queries, fetched, strict=True):
+            self._store(query, value, requested_at)
+            results[idx] = value
+        return results
+
+    async def get(
+        self,
+        query: AffirmationsQuery,
+        fetch_one: FetchOne,
+    ) -> dict[str, Any]:
+        async def _fetch_many(
+            queries: Sequence[AffirmationsQuery],
+        ) -> list[dict[str, Any]]:
+            return [await fetch_one(item) for item in queries]
+
+        (result,) = await self.get_many([query], _fetch_many, fetch_one)
+        return result
+
+
+affirmations_cache = AffirmationsResponseCache(
+    fresh_ttl=settings.cache.affirmations_fresh_seconds,
+    stale_ttl=settings.cache.affirmations_stale_seconds,
+    max_users=settings.cache.affirmations_max_users,
+)
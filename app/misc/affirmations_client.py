@@ -0,0 +1,192 @@
+import asyncio
+import json
+import logging
+import uuid
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+from typing import Annotated
+from typing import Any
+
+from fastapi import Depends
+from faststream import AckPolicy
+from faststream.rabbit import RabbitMessage
+from faststream.rabbit import RabbitQueue
+
+from misc.rabbitmq_broker import GuardedBroker
+from misc.rabbitmq_broker import guarded_broker
+
+if TYPE_CHECKING:
+    from faststream.rabbit.subscriber import RabbitSubscriber
+
+log = logging.getLogger(__name__)
+
+AFFIRMATIONS_QUERY_QUEUE = "qry.affirmations"
+
+
+@dataclass(frozen=True)
+class AffirmationsQuery:
+    type: str
+    payload: dict[str, Any] = field(default_factory=dict)
+
+    def to_message(self) -> dict[str, Any]:
+        return {
+            "type": self.type,
+            "payload": self.payload,
+        }
+
+
+class AffirmationsClient:
+    """
+    RPC-клиент очереди `qry.affirmations`.
+
+    `broker.request` из FastStream на каждый вызов подписывается на reply-очередь
+    и держит общий lock, поэтому запросы одного воркера идут строго по очереди.
+    Клиент один раз подписывается на собственную эксклюзивную reply-очередь
+    процесса и раскладывает ответы по `correlation_id`, так что независимые
+    запросы идут параллельно. `amq.rabbitmq.reply-to` не подходит: он требует
+    публикации в том же канале, где идет чтение, а публикация идет
+    через канал брокера.
+
+    `batch` отправляет несколько запросов одним сообщением:
+    `{"type": "Batch", "payload": {"queries": [...]}}`,
+    в ответ ожидается `{"results": [...]}` в том же порядке.
+
+    Вызовы идут через `GuardedBroker`: таймаут подбирается по типу запроса,
+    а при открытом автомате запрос сразу падает с `CircuitBreakerOpenError`.
+    """
+
+    def __init__(
+        self,
+        broker: GuardedBroker,
+        queue: str = AFFIRMATIONS_QUERY_QUEUE,
+    ) -> None:
+        self._guard = broker
+        self._broker = broker.broker
+        self._queue = queue
+        self._reply_to = RabbitQueue(
+            f"{queue}.reply.{uuid.uuid4().hex}",
+            durable=False,
+            exclusive=True,
+            auto_delete=True,
+        )
+        self._pending: dict[str, asyncio.Future[bytes]] = {}
+        self._subscriber: RabbitSubscriber | None = None
+        self._started = False
+        self._start_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        if self._started:
+            return
+        async with self._start_lock:
+            if self._started:
+                return
+            if self._subscriber is None:
+                self._subscriber = self._broker.subscriber(
+                    self._reply_to,
+                    ack_policy=AckPolicy.ACK_FIRST,
+                    no_reply=True,
+                    include_in_schema=False,
+                )
+                self._subscriber(self._on_reply)
+            await self._subscriber.start()
+            self._started = True
+            log.info("Affirmations RPC reply consumer started")
+
+    async def close(self) -> None:
+        if self._started and self._subscriber is not None:
+            await self._subscriber.stop()
+        self._started = False
+
+        for future in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+
+    async def _on_reply(
+        self,
+        message: RabbitMessage,
+    ) -> None:
+        future = self._pending.get(message.correlation_id or "")
+        if future is None or future.done():
+            log.debug("Dropped RPC reply %s", message.correlation_id)
+            return
+        future.set_result(message.body)
+
+    async def _exchange(
+        self,
+        message: dict[str, Any],
+    ) -> bytes:
+        correlation_id = uuid.uuid4().hex
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        self._pending[correlation_id] = future
+        try:
+            await self._broker.publish(
+                message,
+                queue=self._queue,
+                correlation_id=correlation_id,
+                reply_to=self._reply_to.name,
+            )
+            return await future
+        finally:
+            self._pending.pop(correlation_id, None)
+
+    async def _call(
+        self,
+        message: dict[str, Any],
+    ) -> Any:  # noqa: ANN401
+        await self.start()
+        body = await self._guard.call(
+            message["type"],
+            lambda: self._exchange(message),
+        )
+        return json.loads(body.decode("utf-8"))
+
+    async def query(
+        self,
+        query: AffirmationsQuery,
+    ) -> dict[str, Any]:
+        result: dict[str, Any] = await self._call(query.to_message())
+        return result
+
+    async def gather(
+        self,
+        *queries: AffirmationsQuery,
+    ) -> list[dict[str, Any]]:
+        return list(
+            await asyncio.gather(
+                *(self.query(query) for query in queries),
+            ),
+        )
+
+    async def batch(
+        self,
+        *queries: AffirmationsQuery,
+    ) -> list[dict[str, Any]]:
+        message = {
+            "type": "Batch",
+            "payload": {
+                "queries": [query.to_message() for query in queries],
+            },
+        }
+        response = await self._call(message)
+        results: list[dict[str, Any]] = response["results"]
+        if len(results) != len(queries):
+            error_msg = (
+                f"Batch response has {len(results)} results, expected {len(queries)}"
+            )
+            raise ValueError(error_msg)
+        return results
+
+
+affirmations_client = AffirmationsClient(guarded_broker)
+
+
+def get_affirmations_client() -> AffirmationsClient:
+    return affirmations_client
+
+
+GetAffirmationsClient = Annotated[
+    AffirmationsClient,
+    Depends(get_affirmations_client),
+]
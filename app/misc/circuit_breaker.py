@@ -0,0 +1,163 @@
+import logging
+import math
+import time
+from collections import deque
+from enum import StrEnum
+from typing import TYPE_CHECKING
+from typing import Any
+
+from app_exceptions import CircuitBreakerOpenError
+
+if TYPE_CHECKING:
+    from config.rabbitmq import RabbitBreakerConfig
+
+log = logging.getLogger(__name__)
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Автомат закрыт -> открыт -> полуоткрыт.
+
+    После `failure_threshold` ошибок подряд автомат открывается, и вызовы
+    сразу падают с `CircuitBreakerOpenError`, не занимая воркер на таймаут.
+    Через `recovery_seconds` пропускается не больше `half_open_max_calls`
+    пробных вызовов: успех закрывает автомат, ошибка снова открывает.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        recovery_seconds: float,
+        half_open_max_calls: int = 1,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state is CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_seconds
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+            log.info("Circuit %s is half-open", self.name)
+        return self._state
+
+    def before_call(self) -> None:
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return
+        if (
+            state is CircuitState.HALF_OPEN
+            and self._half_open_calls < self.half_open_max_calls
+        ):
+            self._half_open_calls += 1
+            return
+
+        self.rejected += 1
+        error_msg = f"Circuit {self.name} is {state}"
+        raise CircuitBreakerOpenError(error_msg)
+
+    def record_success(self) -> None:
+        if self._state is not CircuitState.CLOSED:
+            log.info("Circuit %s is closed", self.name)
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._half_open_calls = 0
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if (
+            self._state is CircuitState.HALF_OPEN
+            or self._failures >= self.failure_threshold
+        ):
+            if self._state is not CircuitState.OPEN:
+                log.warning(
+                    "Circuit %s is open after %d failures",
+                    self.name,
+                    self._failures,
+                )
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+            self._half_open_calls = 0
+
+    def release(self) -> None:
+        """Вернуть пробный слот, если вызов прервался не по вине сервиса"""
+        if self._state is CircuitState.HALF_OPEN and self._half_open_calls:
+            self._half_open_calls -= 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "rejected": self.rejected,
+        }
+
+
+class AdaptiveTimeouts:
+    """
+    Таймауты по типам сообщений из наблюдаемых задержек.
+
+    Для каждого типа хранится окно последних `latency_window` успешных
+    задержек. Таймаут равен `timeout_percentile` окна, умноженному
+    на `timeout_multiplier`, и ограничен `min_timeout`/`max_timeout`.
+    Пока замеров меньше `min_samples`, используется `default_timeout`.
+    """
+
+    def __init__(
+        self,
+        config: "RabbitBreakerConfig",
+    ) -> None:
+        self.default_timeout = config.default_timeout
+        self.min_timeout = config.min_timeout
+        self.max_timeout = config.max_timeout
+        self.percentile = config.timeout_percentile
+        self.multiplier = config.timeout_multiplier
+        self.window = config.latency_window
+        self.min_samples = config.min_samples
+        self._samples: dict[str, deque[float]] = {}
+
+    def observe(self, message_type: str, seconds: float) -> None:
+        samples = self._samples.get(message_type)
+        if samples is None:
+            samples = self._samples[message_type] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    @staticmethod
+    def _percentile(samples: deque[float], percentile: float) -> float:
+        ordered = sorted(samples)
+        idx = min(len(ordered) - 1, math.ceil(percentile * len(ordered)) - 1)
+        return ordered[max(idx, 0)]
+
+    def timeout_for(self, message_type: str) -> float:
+        samples = self._samples.get(message_type)
+        if samples is None or len(samples) < self.min_samples:
+            return self.default_timeout
+        timeout = self._percentile(samples, self.percentile) * self.multiplier
+        return min(max(timeout, self.min_timeout), self.max_timeout)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        return {
+            message_type: {
+                "samples": len(samples),
+                "p50_ms": self._percentile(samples, 0.5) * 1000,
+                "p99_ms": self._percentile(samples, 0.99) * 1000,
+                "timeout_ms": self.timeout_for(message_type) * 1000,
+            }
+            for message_type, samples in self._samples.items()
+        }
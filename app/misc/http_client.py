@@ -0,0 +1,144 @@
+import logging
+from collections.abc import Callable
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Any
+
+import aiohttp
+
+from config import settings
+from config.http_client import HttpClientConfig
+from misc.image.security import create_safe_connector
+
+log = logging.getLogger(__name__)
+
+type ConnectorFactory = Callable[..., aiohttp.TCPConnector]
+
+
+@dataclass
+class PoolStats:
+    """
+    Счетчики пула из `aiohttp.TraceConfig`.
+
+    `in_flight` - запросы до получения заголовков ответа,
+    `queued` - ожидания свободного соединения при исчерпанном `limit`.
+    """
+
+    requests: int = 0
+    in_flight: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    queued: int = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(*_: Any) -> None:  # noqa: ANN401
+            self.requests += 1
+            self.in_flight += 1
+
+        async def on_request_done(*_: Any) -> None:  # noqa: ANN401
+            self.in_flight -= 1
+
+        async def on_connection_created(*_: Any) -> None:  # noqa: ANN401
+            self.connections_created += 1
+
+        async def on_connection_reused(*_: Any) -> None:  # noqa: ANN401
+            self.connections_reused += 1
+
+        async def on_connection_queued(*_: Any) -> None:  # noqa: ANN401
+            self.queued += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_done)
+        trace_config.on_request_exception.append(on_request_done)
+        trace_config.on_connection_create_end.append(on_connection_created)
+        trace_config.on_connection_reuseconn.append(on_connection_reused)
+        trace_config.on_connection_queued_start.append(on_connection_queued)
+        trace_config.freeze()
+        return trace_config
+
+
+class HttpClientRegistry:
+    """
+    Общие `aiohttp.ClientSession` для исходящих HTTP-запросов.
+
+    Сессия создается при первом обращении и живет до `close`
+    (вызывается из lifespan), поэтому keep-alive соединения и DNS-кэш
+    коннектора переиспользуются между запросами. Лимиты пула
+    и таймауты берутся из `settings.http`.
+    """
+
+    def __init__(
+        self,
+        config: HttpClientConfig,
+    ) -> None:
+        self.config = config
+        self._factories: dict[str, ConnectorFactory] = {}
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+        self._stats: dict[str, PoolStats] = {}
+
+    def register(
+        self,
+        name: str,
+        connector_factory: ConnectorFactory = aiohttp.TCPConnector,
+    ) -> None:
+        self._factories[name] = connector_factory
+        self._stats[name] = PoolStats()
+
+    def get(
+        self,
+        name: str = "default",
+    ) -> aiohttp.ClientSession:
+        session = self._sessions.get(name)
+        if session is None or session.closed:
+            session = self._create_session(
+                self._factories[name],
+                self._stats[name],
+            )
+            self._sessions[name] = session
+        return session
+
+    def _create_session(
+        self,
+        connector_factory: ConnectorFactory,
+        stats: PoolStats,
+    ) -> aiohttp.ClientSession:
+        connector = connector_factory(
+            limit=self.config.limit,
+            limit_per_host=self.config.limit_per_host,
+            keepalive_timeout=self.config.keepalive_timeout,
+            ttl_dns_cache=self.config.dns_cache_ttl,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=self.config.total_timeout,
+                connect=self.config.connect_timeout,
+            ),
+            trace_configs=[stats.trace_config()],
+        )
+
+    async def close(self) -> None:
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions.clear()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        result: dict[str, dict[str, Any]] = {}
+        for name, session in self._sessions.items():
+            connector = session.connector
+            if connector is None:
+                continue
+            result[name] = {
+                "closed": session.closed,
+                "limit": connector.limit,
+                "limit_per_host": connector.limit_per_host,
+                **asdict(self._stats[name]),
+            }
+        return result
+
+
+http_clients = HttpClientRegistry(settings.http)
+http_clients.register("default")
+http_clients.register("images", create_safe_connector)
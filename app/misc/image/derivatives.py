@@ -0,0 +1,184 @@
+import asyncio
+import io
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from PIL import Image
+
+from app_exceptions import ImageFormatError
+from app_exceptions import ImageProcessingBusyError
+from config import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from core.s3.s3_service import S3Service
+
+log = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    "webp": "image/webp",
+    "avif": "image/avif",
+}
+
+
+@dataclass(frozen=True)
+class Derivative:
+    name: str
+    format: str
+    size: tuple[int, int]
+    data: bytes
+
+
+def render_derivatives(
+    data: bytes,
+    sizes: "Sequence[int]",
+    formats: "Sequence[str]",
+    quality: int,
+) -> list[Derivative]:
+    """
+    Декодировать изображение один раз и собрать все производные.
+
+    Выполняется в дочернем процессе, поэтому принимает и возвращает
+    только сериализуемые значения. Полное декодирование заменяет
+    `Image.verify`: битый файл дает `ImageFormatError`. Миниатюры вписываются в квадрат
+    `size` x `size` с сохранением пропорций, каждая следующая уменьшается
+    из предыдущей. Оригинал пересжимается в каждый формат без изменения размера.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.load()
+            source = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+    except Exception as e:
+        message_error = f"Invalid image: {e}"
+        raise ImageFormatError(message_error) from e
+
+    variants: list[tuple[str, Image.Image]] = [("original", source)]
+    for size in sorted(sizes, reverse=True):
+        thumbnail = variants[-1][1].copy()
+        thumbnail.thumbnail((size, size), Image.Resampling.LANCZOS)
+        variants.append((f"{size}", thumbnail))
+
+    derivatives: list[Derivative] = []
+    for name, variant in variants:
+        for fmt in formats:
+            buf = io.BytesIO()
+            variant.save(buf, format=fmt.upper(), quality=quality)
+            derivatives.append(
+                Derivative(
+                    name=name,
+                    format=fmt,
+                    size=variant.size,
+                    data=buf.getvalue(),
+                ),
+            )
+    return derivatives
+
+
+class DerivativeProcessor:
+    """
+    Генерация производных изображений в `ProcessPoolExecutor`.
+
+    Pillow работает в отдельных процессах и не держит GIL воркеров API.
+    Пул создается при первой задаче, процессы запускаются через
+    `forkserver`: fork из воркера с event loop и открытыми соединениями
+    небезопасен. Одновременно принимается не больше `queue_size` задач, следующие сразу
+    получают `ImageProcessingBusyError` - вызывающий код может ответить 503
+    или повторить позже, а не копить очередь в памяти.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+    ) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self.processed = 0
+        self.rejected = 0
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+            log.info("Image derivative pool started with %d workers", self.workers)
+
+    async def close(self) -> None:
+        if self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    async def render(
+        self,
+        data: bytes,
+        sizes: "Sequence[int]" = tuple(settings.images.thumbnail_sizes),
+        formats: "Sequence[str]" = tuple(settings.images.derivative_formats),
+        quality: int = settings.images.derivative_quality,
+    ) -> list[Derivative]:
+        if self._pending >= self.queue_size:
+            self.rejected += 1
+            message_error = "Image processing queue is full"
+            raise ImageProcessingBusyError(message_error)
+
+        self.start()
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            derivatives = await loop.run_in_executor(
+                self._executor,
+                render_derivatives,
+                data,
+                list(sizes),
+                list(formats),
+                quality,
+            )
+        finally:
+            self._pending -= 1
+        self.processed += 1
+        return derivatives
+
+    @staticmethod
+    async def upload(
+        derivatives: "Sequence[Derivative]",
+        s3_service: "S3Service",
+        target_dir: str | None = None,
+    ) -> dict[str, str]:
+        """Загрузить производные в S3, вернуть `{"<name>.<fmt>": key}`"""
+        keys = await asyncio.gather(
+            *(
+                s3_service.upload_file(
+                    derivative.data,
+                    file_ext=derivative.format,
+                    target_dir=target_dir,
+                    content_type=CONTENT_TYPES[derivative.format],
+                )
+                for derivative in derivatives
+            ),
+        )
+        return {
+            f"{derivative.name}.{derivative.format}": key
+            for derivative, key in zip(derivatives, keys, strict=True)
+        }
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "pending": self._pending,
+            "processed": self.processed,
+            "rejected": self.rejected,
+        }
+
+
+derivative_processor = DerivativeProcessor(
+    workers=settings.images.derivative_workers,
+    queue_size=settings.images.derivative_queue_size,
+)
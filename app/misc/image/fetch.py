@@ -1,4 +1,5 @@
 import logging
+from collections.abc import AsyncGenerator
 
 import aiohttp
 from fastapi import status
@@ -7,9 +8,10 @@ from PIL import Image
 from app_exceptions.exceptions import ImageFetchError
 from app_exceptions.exceptions import ImageFormatError
 from app_exceptions.exceptions import ImageSizeError
+from misc.http_client import http_clients
 from misc.image.security import _is_safe_url
-from misc.image.types import AIOHTTP_TIMEOUT
 from misc.image.types import ALLOWED_CONTENT_TYPES
+from misc.image.types import CHUNK_SIZE
 from misc.image.types import MAX_BYTES
 from misc.image.types import MAX_DIMENSION
 
@@ -18,18 +20,23 @@ log = logging.getLogger(__name__)
 Image.MAX_IMAGE_PIXELS = MAX_DIMENSION * MAX_DIMENSION
 
 
-async def fetch_image_stream(
+async def iter_image_chunks(
     url: str,
-) -> bytes:
+    chunk_size: int = CHUNK_SIZE,
+) -> AsyncGenerator[bytes]:
+    """
+    Скачать изображение по частям с проверкой URL, типа и размера.
+
+    Части отдаются по мере получения, целиком изображение
+    в памяти не собирается.
+    """
     if not _is_safe_url(url):
         message_error = f"Unsafe URL: {url}"
         raise ImageFetchError(message_error)
 
-    timeout = aiohttp.ClientTimeout(total=AIOHTTP_TIMEOUT)
     try:
-        async with aiohttp.ClientSession(
-            timeout=timeout,
-        ) as session, session.get(url) as response:
+        session = http_clients.get("images")
+        async with session.get(url) as response:
             if response.status != status.HTTP_200_OK:
                 message_error = f"HTTP {response.status}"
                 raise ImageFetchError(message_error)
@@ -47,22 +54,27 @@ async def fetch_image_stream(
                 raise ImageSizeError(message_error)
 
             total = 0
-            chunks = []
-            async for chunk in response.content.iter_chunked(64 * 1024):
+            async for chunk in response.content.iter_chunked(chunk_size):
                 total += len(chunk)
                 if total > MAX_BYTES:
                     message_error = "Image too large"
                     raise ImageSizeError(message_error)
-                chunks.append(chunk)
+                yield chunk
 
-            data = b"".join(chunks)
-            if not data:
+            if not total:
                 message_error = "No data received"
                 raise ImageFetchError(message_error)
 
-            return data
-
     except aiohttp.ClientError as e:
         message_error = f"Failed to fetch image: {e}"
         log.warning(message_error)
         raise ImageFetchError(message_error) from e
+
+
+async def fetch_image_stream(
+    url: str,
+) -> bytes:
+    data = bytearray()
+    async for chunk in iter_image_chunks(url):
+        data += chunk
+    return bytes(data)
@@ -0,0 +1,194 @@
+import contextlib
+import logging
+import time
+from collections.abc import AsyncGenerator
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from dataclasses import field
+
+from PIL import ImageFile
+
+from app_exceptions.exceptions import ImageFormatError
+from core.s3.s3_service import S3Service
+from misc.image.derivatives import Derivative
+from misc.image.derivatives import derivative_processor
+from misc.image.detect import detect_image_type
+from misc.image.fetch import iter_image_chunks
+from misc.image.types import CONTENT_TYPES
+from misc.image.types import MAX_HEADER_BYTES
+from misc.image.validate import check_image_header
+
+log = logging.getLogger(__name__)
+
+# Самая длинная сигнатура в detect_image_type (PNG)
+SIGNATURE_SIZE = 8
+
+
+@dataclass
+class ImageUploadResult:
+    object_key: str
+    format: str
+    size: tuple[int, int]
+    bytes_total: int
+    timings_ms: dict[str, float] = field(default_factory=dict)
+    derivatives: dict[str, str] = field(default_factory=dict)
+
+
+async def _chain(
+    head: list[bytes],
+    chunks: AsyncIterator[bytes],
+) -> AsyncGenerator[bytes]:
+    """Сначала уже прочитанные чанки заголовка, затем остаток потока"""
+    while head:
+        yield head.pop(0)
+    async for chunk in chunks:
+        yield chunk
+
+
+class ImageHeaderSniffer:
+    """
+    Разбор начала изображения по мере скачивания.
+
+    По первым байтам определяется тип (`detect_image_type`), затем
+    `ImageFile.Parser` получает данные только до разбора заголовка:
+    формат и размеры известны после первых килобайт, пиксели не декодируются.
+    `close` освобождает парсер и его декодер.
+    """
+
+    def __init__(self) -> None:
+        self.detected_type: str | None = None
+        self.format: str | None = None
+        self.size: tuple[int, int] | None = None
+        self._parser = ImageFile.Parser()
+        self._fed = 0
+        self._head = b""
+
+    @property
+    def header_parsed(self) -> bool:
+        return self.size is not None
+
+    def feed(self, chunk: bytes) -> None:
+        if self.header_parsed:
+            return
+
+        if self.detected_type is None:
+            self._head += chunk
+            if len(self._head) < SIGNATURE_SIZE:
+                return
+            self.detected_type = detect_image_type(self._head)
+            chunk, self._head = self._head, b""
+
+        try:
+            self._parser.feed(chunk)
+        except Exception as e:
+            message_error = f"Invalid image: {e}"
+            raise ImageFormatError(message_error) from e
+
+        self._fed += len(chunk)
+        image = self._parser.image
+        if image is not None:
+            self.format, self.size = check_image_header(
+                self.detected_type,
+                image.format,
+                image.size,
+            )
+        elif self._fed > MAX_HEADER_BYTES:
+            message_error = "Image header is too large"
+            raise ImageFormatError(message_error)
+
+    def close(self) -> None:
+        # Парсер получил только начало файла, ошибка неполных данных ожидаема
+        with contextlib.suppress(Exception):
+            self._parser.close()
+        if self._parser.image is not None:
+            self._parser.image.close()
+
+    def result(self) -> tuple[str, tuple[int, int]]:
+        if self.format is None or self.size is None:
+            message_error = "Invalid image: header not found"
+            raise ImageFormatError(message_error)
+        return self.format, self.size
+
+
+async def fetch_validate_upload(
+    url: str,
+    s3_service: S3Service,
+    target_dir: str | None = None,
+    with_derivatives: bool = False,
+) -> ImageUploadResult:
+    """
+    Скачать изображение, проверить его и загрузить в S3 за один проход.
+
+    Неверный тип отсекается по первому чанку, формат и размеры читаются
+    из заголовка один раз. После заголовка чанки сразу уходят
+    в `S3Service.upload_stream`.
+
+    Без производных тело не буферизуется и не декодируется: проверка
+    ограничена заголовком. С `with_derivatives` байты копятся
+    (не больше `MAX_BYTES`) для пула процессов, и поток завершается
+    только после сборки производных. Сборка полностью декодирует
+    изображение, поэтому битый файл не попадает в бакет: ошибка
+    прерывает загрузку до `put_object` или `complete_multipart_upload`.
+    """
+    started_at = time.perf_counter()
+    head: list[bytes] = []
+    buffer = bytearray() if with_derivatives else None
+    derivatives: list[Derivative] = []
+    bytes_total = 0
+    render_ms = 0.0
+
+    async with contextlib.aclosing(iter_image_chunks(url)) as chunks:
+        with contextlib.closing(ImageHeaderSniffer()) as sniffer:
+            async for chunk in chunks:
+                head.append(chunk)
+                sniffer.feed(chunk)
+                if sniffer.header_parsed:
+                    break
+            fmt, size = sniffer.result()
+        header_at = time.perf_counter()
+
+        async def body() -> AsyncGenerator[bytes]:
+            nonlocal bytes_total, derivatives, render_ms
+            async for chunk in _chain(head, chunks):
+                bytes_total += len(chunk)
+                if buffer is not None:
+                    buffer.extend(chunk)
+                yield chunk
+
+            if buffer is not None:
+                render_started_at = time.perf_counter()
+                derivatives = await derivative_processor.render(bytes(buffer))
+                render_ms = (time.perf_counter() - render_started_at) * 1000
+
+        object_key = await s3_service.upload_stream(
+            body(),
+            file_ext=fmt,
+            target_dir=target_dir,
+            content_type=CONTENT_TYPES[fmt],
+        )
+    uploaded_at = time.perf_counter()
+
+    derivative_keys = await derivative_processor.upload(
+        derivatives,
+        s3_service,
+        target_dir=target_dir,
+    )
+    finished_at = time.perf_counter()
+
+    timings_ms = {
+        "header": (header_at - started_at) * 1000,
+        "upload": (uploaded_at - header_at) * 1000 - render_ms,
+        "render": render_ms,
+        "derivatives": (finished_at - uploaded_at) * 1000,
+        "total": (finished_at - started_at) * 1000,
+    }
+    log.debug("Image %s uploaded as %s: %s", url, object_key, timings_ms)
+
+    return ImageUploadResult(
+        object_key=object_key,
+        format=fmt,
+        size=size,
+        bytes_total=bytes_total,
+        timings_ms=timings_ms,
+        derivatives=derivative_keys,
+    )
@@ -1,13 +1,70 @@
 import ipaddress
 import socket
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+from typing import Any
 from urllib.parse import urlparse
 
+from aiohttp import TCPConnector
+from aiohttp.abc import AbstractResolver
+from aiohttp.abc import ResolveResult
+from aiohttp.resolver import DefaultResolver
+
 from misc.image.types import ALLOWED_SCHEMES
+from misc.image.types import DNS_CACHE_SIZE
+from misc.image.types import DNS_CACHE_TTL
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from aiohttp.tracing import Trace
+
+BLOCKED_HOSTNAMES = ("localhost",)
+NAT64_NETWORK = ipaddress.IPv6Network("64:ff9b::/96")
+
+
+def _embedded_ipv4(
+    ip: ipaddress.IPv6Address,
+) -> ipaddress.IPv4Address | None:
+    """IPv4-адрес, вложенный в IPv6 (IPv4-mapped или NAT64 `64:ff9b::/96`)"""
+    if ip.ipv4_mapped is not None:
+        return ip.ipv4_mapped
+    if ip in NAT64_NETWORK:
+        return ipaddress.IPv4Address(int(ip) & 0xFFFFFFFF)
+    return None
+
+
+def _is_public_ip(
+    ip_str: str,
+) -> bool:
+    """
+    Адрес глобально маршрутизируемый (`is_global`) и не multicast.
+
+    Для IPv6 с вложенным IPv4 проверяется сам IPv4, поэтому
+    `::ffff:10.0.0.1` и `64:ff9b::a00:1` запрещены так же, как `10.0.0.1`.
+    """
+    try:
+        ip = ipaddress.ip_address(ip_str.split("%", 1)[0])
+    except ValueError:
+        return False
+
+    if isinstance(ip, ipaddress.IPv6Address):
+        ip = _embedded_ipv4(ip) or ip
+
+    return ip.is_global and not ip.is_multicast
 
 
 def _is_safe_url(
     url: str,
 ) -> bool:
+    """
+    Проверка URL без обращения к DNS.
+
+    Имена хостов проверяет `SafeResolver` при подключении,
+    здесь отсекаются схема, пустой хост и непубличные IP-литералы,
+    которые aiohttp подключает без резолвера.
+    """
     try:
         parsed = urlparse(url)
         if parsed.scheme not in ALLOWED_SCHEMES:
@@ -17,21 +74,117 @@ def _is_safe_url(
         if not hostname:
             return False
 
+        if hostname.lower().rstrip(".") in BLOCKED_HOSTNAMES:
+            return False
+
         try:
-            ip_str = socket.gethostbyname(hostname)
-            ip = ipaddress.ip_address(ip_str)
-            if ip.is_private or ip.is_loopback or ip.is_reserved:
-                return False
-
-        except (OSError, ValueError):
-            blocked = (
-                "localhost",
-                "127.0.0.1",
-            )
-            if hostname.lower() in blocked:
-                return False
+            ipaddress.ip_address(hostname)
+        except ValueError:
+            return True
+
+        return _is_public_ip(hostname)
 
     except Exception:  # noqa: BLE001
         return False
 
-    return True
+
+class SafeResolver(AbstractResolver):
+    """
+    Резолвер aiohttp с защитой от SSRF и TTL-кэшем.
+
+    Разрешение имени идет без блокировки event loop (резолвер aiohttp
+    по умолчанию), проверяются все A/AAAA записи: если хоть одна
+    непубличная, подключение запрещается. Соединение открывается
+    к тем же проверенным адресам, поэтому повторный DNS-ответ
+    (DNS rebinding) не может подменить цель.
+    Результаты, включая запреты, кэшируются на `ttl` секунд.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DNS_CACHE_TTL,
+        max_size: int = DNS_CACHE_SIZE,
+    ) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._resolver: AbstractResolver | None = None
+        self._cache: OrderedDict[
+            tuple[str, int],
+            tuple[float, list[ResolveResult] | None],
+        ] = OrderedDict()
+
+    async def _lookup(
+        self,
+        host: str,
+        family: socket.AddressFamily,
+    ) -> list[ResolveResult] | None:
+        key = (host, family)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            return cached[1]
+
+        if self._resolver is None:
+            self._resolver = DefaultResolver()
+        results = await self._resolver.resolve(host, 0, family)
+        safe_results = (
+            results if all(_is_public_ip(r["host"]) for r in results) else None
+        )
+
+        self._cache[key] = (time.monotonic() + self.ttl, safe_results)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+        return safe_results
+
+    async def resolve(
+        self,
+        host: str,
+        port: int = 0,
+        family: socket.AddressFamily = socket.AF_INET,
+    ) -> list[ResolveResult]:
+        results = await self._lookup(host, family)
+        if not results:
+            message_error = f"Host {host} resolves to a non-public address"
+            raise OSError(message_error)
+        return [ResolveResult(**{**result, "port": port}) for result in results]
+
+    async def close(self) -> None:
+        if self._resolver is not None:
+            await self._resolver.close()
+        self._resolver = None
+
+
+safe_resolver = SafeResolver()
+
+
+class SafeTCPConnector(TCPConnector):
+    """
+    Коннектор, который не подключается к непубличным адресам.
+
+    Имена разрешает `SafeResolver`, а IP-литералы, которые aiohttp
+    подключает без резолвера (например, после редиректа),
+    проверяются здесь.
+    """
+
+    async def _resolve_host(
+        self,
+        host: str,
+        port: int,
+        traces: "Sequence[Trace] | None" = None,
+    ) -> list[ResolveResult]:
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            pass
+        else:
+            if not _is_public_ip(host):
+                message_error = f"Non-public address {host}"
+                raise OSError(message_error)
+        return await super()._resolve_host(host, port, traces)
+
+
+def create_safe_connector(
+    **kwargs: Any,  # noqa: ANN401
+) -> SafeTCPConnector:
+    return SafeTCPConnector(resolver=safe_resolver, **kwargs)
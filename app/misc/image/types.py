@@ -12,4 +12,11 @@ ALLOWED_CONTENT_TYPES = (
     "image/png",
     "image/jpeg",
 )
-AIOHTTP_TIMEOUT = 10
+DNS_CACHE_TTL = 60
+DNS_CACHE_SIZE = 1024
+CHUNK_SIZE = 64 * 1024
+MAX_HEADER_BYTES = 1024 * 1024
+CONTENT_TYPES = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+}
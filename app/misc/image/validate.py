@@ -10,28 +10,11 @@ from misc.image.types import ALLOWED_FORMATS
 from misc.image.types import MAX_DIMENSION
 
 
-async def validate_image_bytes(
-    data: bytes,
+def check_image_header(
+    detected_type: str,
+    fmt: str | None,
+    size: tuple[int, int],
 ) -> tuple[str, tuple[int, int]]:
-    detected_type = detect_image_type(data)
-
-    def _open_image(
-        buf: bytes,
-    ) -> tuple[str | None, tuple[int, int]]:
-        bio = io.BytesIO(buf)
-        img = Image.open(bio)
-        img.verify()
-
-        bio.seek(0)
-        img2 = Image.open(bio)
-        return img2.format, img2.size
-
-    try:
-        fmt, size = await asyncio.to_thread(_open_image, data)
-    except Exception as e:
-        message_error = f"Invalid image: {e}"
-        raise ImageFormatError(message_error) from e
-
     fmt_lower = fmt.lower() if fmt else ""
 
     if fmt_lower == "jpg":
@@ -51,3 +34,35 @@ async def validate_image_bytes(
         raise ImageSizeError(message_error)
 
     return fmt_lower, size
+
+
+def _verify_image(
+    data: bytes,
+) -> tuple[str | None, tuple[int, int]]:
+    with Image.open(io.BytesIO(data)) as img:
+        fmt, size = img.format, img.size
+        img.verify()
+    return fmt, size
+
+
+async def verify_image_bytes(
+    data: bytes,
+) -> tuple[str | None, tuple[int, int]]:
+    """
+    Проверить целостность изображения через `Image.verify` в потоке.
+
+    Формат и размеры читаются при том же открытии, до `verify`.
+    """
+    try:
+        return await asyncio.to_thread(_verify_image, data)
+    except Exception as e:
+        message_error = f"Invalid image: {e}"
+        raise ImageFormatError(message_error) from e
+
+
+async def validate_image_bytes(
+    data: bytes,
+) -> tuple[str, tuple[int, int]]:
+    detected_type = detect_image_type(data)
+    fmt, size = await verify_image_bytes(data)
+    return check_image_header(detected_type, fmt, size)
@@ -0,0 +1,173 @@
+import asyncio
+import contextlib
+import logging
+from collections.abc import Awaitable
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from config import settings
+from core.crud.managers import JobManager
+from core.database.db_helper import db_helper
+
+log = logging.getLogger(__name__)
+
+type JobProgress = Callable[[dict[str, Any]], Awaitable[None]]
+type JobHandler = Callable[
+    [AsyncSession, dict[str, Any], JobProgress],
+    Awaitable[dict[str, Any]],
+]
+
+
+class JobRunner:
+    """
+    Фоновое выполнение задач из таблицы `jobs`.
+
+    Воркер забирает самую старую задачу `FOR UPDATE SKIP LOCKED`,
+    помечает ее `running` и вызывает обработчик, зарегистрированный
+    для `kind`. Обработчик получает отдельную сессию, `payload` задачи
+    и функцию для записи прогресса, а возвращает результат задачи.
+    Одновременно выполняется не больше `concurrency` задач на процесс.
+
+    Задача, прерванная остановкой процесса, остается в статусе `running`.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        concurrency: int,
+        poll_interval: float,
+    ) -> None:
+        self._session_factory = session_factory
+        self.concurrency = max(concurrency, 1)
+        self.poll_interval = poll_interval
+        self._handlers: dict[str, JobHandler] = {}
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+        self.active = 0
+        self.succeeded = 0
+        self.failed = 0
+
+    def register(
+        self,
+        kind: str,
+        handler: JobHandler,
+    ) -> None:
+        self._handlers[kind] = handler
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
+        log.info("Job runner started with %d workers", self.concurrency)
+
+    async def stop(self) -> None:
+        if not self._tasks:
+            return
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+        log.info("Job runner stopped")
+
+    def notify(self) -> None:
+        """Разбудить воркеры сразу после постановки задачи"""
+        self._wakeup.set()
+
+    async def _claim(self) -> tuple[int, str, dict[str, Any]] | None:
+        async with self._session_factory() as session:
+            job = await JobManager(session).claim_next()
+            if job is None:
+                return None
+            await session.commit()
+            return job.id, job.kind, job.payload
+
+    async def _set_progress(
+        self,
+        job_id: int,
+        progress: dict[str, Any],
+    ) -> None:
+        async with self._session_factory() as session:
+            await JobManager(session).set_progress(job_id, progress)
+            await session.commit()
+
+    async def _finish(
+        self,
+        job_id: int,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> None:
+        async with self._session_factory() as session:
+            await JobManager(session).finish(job_id, result=result, error=error)
+            await session.commit()
+
+    async def run_job(
+        self,
+        job_id: int,
+        kind: str,
+        payload: dict[str, Any],
+    ) -> None:
+        handler = self._handlers.get(kind)
+        if handler is None:
+            self.failed += 1
+            await self._finish(job_id, error=f"Unknown job kind: {kind}")
+            return
+
+        async def progress(value: dict[str, Any]) -> None:
+            await self._set_progress(job_id, value)
+
+        self.active += 1
+        try:
+            async with self._session_factory() as session:
+                result = await handler(session, payload, progress)
+        except Exception as e:
+            log.exception("Job %d (%s) failed", job_id, kind)
+            self.failed += 1
+            await self._finish(job_id, error=repr(e))
+        else:
+            self.succeeded += 1
+            await self._finish(job_id, result=result)
+        finally:
+            self.active -= 1
+
+    async def _worker(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                claimed = await self._claim()
+                if claimed is not None:
+                    await self.run_job(*claimed)
+                    continue
+            except SQLAlchemyError as e:
+                log.warning(
+                    "Job runner failed, retry in %.1fs: %r",
+                    self.poll_interval,
+                    e,
+                )
+
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(self.poll_interval):
+                    await self._wakeup.wait()
+
+    def stats(self) -> dict[str, int | bool]:
+        return {
+            "running": any(not task.done() for task in self._tasks),
+            "workers": len(self._tasks),
+            "active": self.active,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+        }
+
+
+job_runner = JobRunner(
+    session_factory=db_helper.session_factory,
+    concurrency=settings.jobs.concurrency,
+    poll_interval=settings.jobs.poll_interval_seconds,
+)
@@ -0,0 +1,188 @@
+import asyncio
+import contextlib
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app_exceptions import CircuitBreakerOpenError
+from config import settings
+from core.crud.managers import OutboxManager
+from core.database.db_helper import db_helper
+from misc.rabbitmq_broker import BROKER_ERRORS
+from misc.rabbitmq_broker import GuardedBroker
+from misc.rabbitmq_broker import guarded_broker
+
+log = logging.getLogger(__name__)
+
+RELAY_ERRORS = (*BROKER_ERRORS, CircuitBreakerOpenError, SQLAlchemyError)
+
+type PublishedCallback = Callable[[dict[str, Any]], None]
+
+
+class OutboxRelay:
+    """
+    Фоновая отправка команд из таблицы `outbox_messages` в RabbitMQ.
+
+    Пачка до `batch_size` строк блокируется `FOR UPDATE SKIP LOCKED`,
+    сообщения публикуются по порядку с подтверждением брокера
+    (publisher confirms включены в FastStream по умолчанию),
+    отправленные строки удаляются в той же транзакции.
+    При любой ошибке relay ждет с экспоненциальной задержкой,
+    неотправленные строки остаются в таблице.
+    Сообщение, которое не удалось отправить `max_attempts` раз,
+    откладывается (`parked_at`) и больше не блокирует очередь.
+    Открытый breaker попыткой не считается.
+
+    Доставка at-least-once: `message_id` сообщения равен `outbox-<id>`,
+    по нему потребитель может отбросить повтор.
+    Порядок сохраняется в пределах одного воркера.
+
+    Обработчики из `subscribe` вызываются после подтверждения публикации
+    каждого сообщения своей очереди.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        broker: GuardedBroker,
+        batch_size: int,
+        poll_interval: float,
+        max_backoff: float,
+        max_attempts: int,
+    ) -> None:
+        self._session_factory = session_factory
+        self._broker = broker
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._listeners: dict[str, list[PublishedCallback]] = {}
+        self.published = 0
+        self.failed = 0
+        self.parked = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            log.info("Outbox relay started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        log.info("Outbox relay stopped")
+
+    def subscribe(
+        self,
+        queue: str,
+        callback: PublishedCallback,
+    ) -> None:
+        self._listeners.setdefault(queue, []).append(callback)
+
+    def _on_published(
+        self,
+        queue: str,
+        message: dict[str, Any],
+    ) -> None:
+        for callback in self._listeners.get(queue, ()):
+            try:
+                callback(message)
+            except Exception:
+                log.exception("Outbox listener for %s failed", queue)
+
+    def notify(self) -> None:
+        """Разбудить relay сразу после записи новой команды"""
+        self._wakeup.set()
+
+    async def drain_once(self) -> int:
+        async with self._session_factory() as session:
+            manager = OutboxManager(session)
+            batch = await manager.lock_batch(self.batch_size)
+            if not batch:
+                return 0
+
+            published_ids: list[int] = []
+            try:
+                for row in batch:
+                    await self._broker.publish(
+                        row.message,
+                        queue=row.queue,
+                        persist=True,
+                        message_id=f"outbox-{row.id}",
+                    )
+                    published_ids.append(row.id)
+                    self._on_published(row.queue, row.message)
+            except Exception as e:
+                self.failed += 1
+                if not isinstance(e, CircuitBreakerOpenError):
+                    await self._mark_failed(manager, batch[len(published_ids)].id)
+                raise
+            finally:
+                await manager.delete_published(published_ids)
+                await session.commit()
+                self.published += len(published_ids)
+        return len(published_ids)
+
+    async def _mark_failed(
+        self,
+        manager: OutboxManager,
+        obj_id: int,
+    ) -> None:
+        if await manager.mark_failed(obj_id, self.max_attempts):
+            self.parked += 1
+            log.error(
+                "Outbox message %s parked after %d failed attempts",
+                obj_id,
+                self.max_attempts,
+            )
+
+    async def _run(self) -> None:
+        backoff = self.poll_interval
+        while True:
+            self._wakeup.clear()
+            try:
+                published = await self.drain_once()
+            except RELAY_ERRORS as e:
+                log.warning("Outbox relay failed, retry in %.1fs: %r", backoff, e)
+                delay = backoff
+                backoff = min(backoff * 2, self.max_backoff)
+            except Exception:
+                log.exception("Outbox relay crashed, retry in %.1fs", backoff)
+                delay = backoff
+                backoff = min(backoff * 2, self.max_backoff)
+            else:
+                backoff = self.poll_interval
+                if published == self.batch_size:
+                    continue
+                delay = self.poll_interval
+
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(delay):
+                    await self._wakeup.wait()
+
+    def stats(self) -> dict[str, int | bool]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "published": self.published,
+            "failed": self.failed,
+            "parked": self.parked,
+        }
+
+
+outbox_relay = OutboxRelay(
+    session_factory=db_helper.session_factory,
+    broker=guarded_broker,
+    batch_size=settings.rabbit.outbox.batch_size,
+    poll_interval=settings.rabbit.outbox.poll_interval_seconds,
+    max_backoff=settings.rabbit.outbox.max_backoff_seconds,
+    max_attempts=settings.rabbit.outbox.max_attempts,
+)
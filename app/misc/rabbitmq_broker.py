@@ -1,16 +1,98 @@
+import asyncio
+import time
+from collections.abc import Awaitable
+from collections.abc import Callable
 from typing import Annotated
+from typing import Any
 
+from aio_pika.exceptions import AMQPError
 from fastapi import Depends
 from faststream.rabbit import RabbitBroker
 from faststream.rabbit import fastapi
 
 from config import settings
+from misc.circuit_breaker import AdaptiveTimeouts
+from misc.circuit_breaker import CircuitBreaker
+
+# Ошибки, означающие недоступность брокера для вызывающего кода
+BROKER_ERRORS = (TimeoutError, ConnectionError, AMQPError)
 
 rabbitmq_broker = fastapi.RabbitRouter(
     settings.rabbit.url,
 )
 
 
+class GuardedBroker:
+    """
+    Обертка над `RabbitBroker` с автоматом и адаптивными таймаутами.
+
+    Каждый вызов проходит через общий `CircuitBreaker`: при открытом
+    автомате сразу поднимается `CircuitBreakerOpenError`. Таймаут берется
+    из `AdaptiveTimeouts` по типу сообщения (`message["type"]`),
+    успешные задержки пополняют статистику этого типа.
+    """
+
+    def __init__(
+        self,
+        broker: RabbitBroker,
+        breaker: CircuitBreaker,
+        timeouts: AdaptiveTimeouts,
+    ) -> None:
+        self.broker = broker
+        self.breaker = breaker
+        self.timeouts = timeouts
+
+    async def call[T](
+        self,
+        message_type: str,
+        func: Callable[[], Awaitable[T]],
+    ) -> T:
+        self.breaker.before_call()
+        started_at = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeouts.timeout_for(message_type)):
+                result = await func()
+        except BROKER_ERRORS:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+
+        self.breaker.record_success()
+        self.timeouts.observe(message_type, time.perf_counter() - started_at)
+        return result
+
+    async def publish(
+        self,
+        message: dict[str, Any],
+        queue: str,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        await self.call(
+            message["type"],
+            lambda: self.broker.publish(message, queue=queue, **kwargs),
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.breaker.stats(),
+            "timeouts": self.timeouts.stats(),
+        }
+
+
+guarded_broker = GuardedBroker(
+    broker=rabbitmq_broker.broker,
+    breaker=CircuitBreaker(
+        name="rabbitmq",
+        failure_threshold=settings.rabbit.breaker.failure_threshold,
+        recovery_seconds=settings.rabbit.breaker.recovery_seconds,
+        half_open_max_calls=settings.rabbit.breaker.half_open_max_calls,
+    ),
+    timeouts=AdaptiveTimeouts(settings.rabbit.breaker),
+)
+
+
 def get_broker() -> RabbitBroker:
     return rabbitmq_broker.broker
 
@@ -19,3 +101,13 @@ GetRabbitBroker = Annotated[
     RabbitBroker,
     Depends(get_broker),
 ]
+
+
+def get_guarded_broker() -> GuardedBroker:
+    return guarded_broker
+
+
+GetGuardedBroker = Annotated[
+    GuardedBroker,
+    Depends(get_guarded_broker),
+]
@@ -0,0 +1,157 @@
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from dataclasses import asdict
+from dataclasses import dataclass
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from config import settings
+from core.crud.managers import ProjectManager
+from core.crud.managers import UserManager
+from core.database.db_helper import db_helper
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class ArchiveReport:
+    projects: int = 0
+    users: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class SoftDeleteArchiver:
+    """
+    Перенос мягко удаленных проектов и пользователей в архивные таблицы.
+
+    Строки, удаленные больше `retention_days` назад, переносятся пачками
+    по `batch_size`: каждая пачка - один запрос и отдельная короткая
+    транзакция, строки берутся `FOR UPDATE SKIP LOCKED`. Сначала
+    переносятся проекты, затем пользователи без оставшихся проектов.
+
+    При нескольких воркерах прогоны не мешают друг другу,
+    но делят строки между собой.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        retention_days: int,
+        batch_size: int,
+        interval: float,
+        batch_pause: float,
+    ) -> None:
+        self._session_factory = session_factory
+        self.retention = timedelta(days=retention_days)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.batch_pause = batch_pause
+        self._task: asyncio.Task[None] | None = None
+        self.last_report: ArchiveReport | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            log.info("Soft delete archiver started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        log.info("Soft delete archiver stopped")
+
+    async def _archive_table(
+        self,
+        manager_cls: type[ProjectManager | UserManager],
+        deleted_before: datetime,
+        report: ArchiveReport,
+    ) -> int:
+        moved_total = 0
+        while True:
+            async with self._session_factory() as session:
+                moved = await manager_cls(session).archive_deleted_batch(
+                    deleted_before,
+                    self.batch_size,
+                )
+                await session.commit()
+            report.batches += 1
+            moved_total += moved
+            if moved < self.batch_size:
+                return moved_total
+            await asyncio.sleep(self.batch_pause)
+
+    async def archive_once(self) -> ArchiveReport:
+        report = ArchiveReport()
+        started_at = time.perf_counter()
+        deleted_before = datetime.now(UTC).replace(tzinfo=None) - self.retention
+
+        report.projects = await self._archive_table(
+            ProjectManager,
+            deleted_before,
+            report,
+        )
+        report.users = await self._archive_table(UserManager, deleted_before, report)
+
+        report.seconds = time.perf_counter() - started_at
+        self.last_report = report
+        log.info(
+            "Archived %d projects and %d users in %d batches, %.2fs",
+            report.projects,
+            report.users,
+            report.batches,
+            report.seconds,
+        )
+        return report
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.archive_once()
+            except SQLAlchemyError as e:
+                log.warning("Soft delete archiver failed: %r", e)
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "last_report": self.last_report.to_dict() if self.last_report else None,
+        }
+
+
+soft_delete_archiver = SoftDeleteArchiver(
+    session_factory=db_helper.session_factory,
+    retention_days=settings.archive.retention_days,
+    batch_size=settings.archive.batch_size,
+    interval=settings.archive.interval_seconds,
+    batch_pause=settings.archive.batch_pause_seconds,
+)
+
+
+async def main() -> None:
+    try:
+        report = await soft_delete_archiver.archive_once()
+    finally:
+        await db_helper.dispose()
+    print(json.dumps(report.to_dict()))  # noqa: T201
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.log.level)
+    asyncio.run(main())
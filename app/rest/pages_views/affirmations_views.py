@@ -14,8 +14,7 @@ from config import settings
 from misc.flash_messages import flash
 from paths_constants import templates
 from rest.pages_views.dependencies.affirmations import delete_user_affirmation
-from rest.pages_views.dependencies.affirmations import get_dict_with_user_affirmations
-from rest.pages_views.dependencies.affirmations import get_user_settings
+from rest.pages_views.dependencies.affirmations import get_affirmations_page_data
 from rest.pages_views.dependencies.user_data import get_user_data_by_access_token
 from rest.pages_views.redirect import redirect_to_login_page
 from rest.pages_views.schemas.user_data import UserDataReadSchema
@@ -40,16 +39,13 @@ async def page_user_affirmations(
         UserDataReadSchema,
         Depends(get_user_data_by_access_token),
     ],
-    affirmations: Annotated[
-        dict[str, Any],
-        Depends(get_dict_with_user_affirmations),
-    ],
-    user_settings: Annotated[
-        dict[str, Any],
-        Depends(get_user_settings),
+    page_data: Annotated[
+        tuple[dict[str, Any], dict[str, Any]],
+        Depends(get_affirmations_page_data),
     ],
 ) -> HTMLResponse:
     """Страница с пользовательскими аффирмациями"""
+    affirmations, user_settings = page_data
     context = {}
     context_data = {
         "request": request,
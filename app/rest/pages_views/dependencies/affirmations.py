@@ -1,33 +1,34 @@
-import json
+from collections.abc import Sequence
 from typing import Annotated
 from typing import Any
 from typing import Literal
 
 from fastapi import Depends
-from fastapi import HTTPException
-from fastapi import status
 from fastapi.params import Body
 from fastapi.params import Query
 
 from api.api_v2.users_views.affirmations_views.schemas import ChangeAffirmationsSettings
 from api.api_v2.users_views.affirmations_views.schemas import UpdateAffirmation
-from app_exceptions import UserNotFoundError
 from app_exceptions.exceptions import RabbitMQServiceUnavailableError
-from auth import jwt_helper
+from auth.current_user import CurrentUser
+from config import settings
 from core.crud import GetCRUDService
-from misc.rabbitmq_broker import GetRabbitBroker
+from misc.affirmations_cache import affirmations_cache
+from misc.affirmations_client import AffirmationsQuery
+from misc.affirmations_client import GetAffirmationsClient
+from misc.outbox_relay import outbox_relay
+from misc.rabbitmq_broker import BROKER_ERRORS
 from rest.pages_views.dependencies.user_data import get_user_data_by_access_token
 from rest.pages_views.schemas import GetListAffirmationsResponse
 from rest.pages_views.schemas import UserDataReadSchema
 from rest.pages_views.schemas.affirmations_data import GetUserSettingsResponse
 
 
-async def get_dict_with_user_affirmations(
+async def get_affirmations_list_query(
     user_data: Annotated[
         UserDataReadSchema,
         Depends(get_user_data_by_access_token),
     ],
-    broker: GetRabbitBroker,
     limit: Annotated[
         int,
         Query(
@@ -59,172 +60,156 @@ async def get_dict_with_user_affirmations(
         ],
         Query(title="Order", description="По возрастанию или убыванию"),
     ] = "asc",
-) -> dict[str, Any]:
-    try:
-        message = {
-            "type": "GetPaginatedAffirmations",
-            "payload": {
-                "user_tg": user_data.tg_id,
-                "limit": limit,
-                "offset": offset,
-                "sort_by": sort_by,
-                "order": order,
-            },
-        }
-        result = await broker.request(
-            message,
-            queue="qry.affirmations",
-            timeout=3,
-        )
-        decoded_broker_response = json.loads(
-            result.body.decode("utf-8"),
-        )
-        return GetListAffirmationsResponse.model_validate(
-            decoded_broker_response,
-        ).model_dump()
-    except TimeoutError as e:
-        raise RabbitMQServiceUnavailableError from e
+) -> AffirmationsQuery:
+    return AffirmationsQuery(
+        type="GetPaginatedAffirmations",
+        payload={
+            "user_tg": user_data.tg_id,
+            "limit": limit,
+            "offset": offset,
+            "sort_by": sort_by,
+            "order": order,
+        },
+    )
 
 
-async def get_user_settings(
+async def get_user_settings_query(
     user_data: Annotated[
         UserDataReadSchema,
         Depends(get_user_data_by_access_token),
     ],
-    broker: GetRabbitBroker,
+) -> AffirmationsQuery:
+    return AffirmationsQuery(
+        type="GetUserSettings",
+        payload={
+            "user_tg": user_data.tg_id,
+        },
+    )
+
+
+async def get_dict_with_user_affirmations(
+    client: GetAffirmationsClient,
+    query: Annotated[
+        AffirmationsQuery,
+        Depends(get_affirmations_list_query),
+    ],
 ) -> dict[str, Any]:
     try:
-        message = {
-            "type": "GetUserSettings",
-            "payload": {
-                "user_tg": user_data.tg_id,
-            },
-        }
-
-        result = await broker.request(
-            message,
-            queue="qry.affirmations",
-            timeout=3,
-        )
-        decoded_broker_response = json.loads(
-            result.body.decode("utf-8"),
+        result = await affirmations_cache.get(query, client.query)
+    except BROKER_ERRORS as e:
+        raise RabbitMQServiceUnavailableError from e
+    return GetListAffirmationsResponse.model_validate(result).model_dump()
+
+
+async def get_affirmations_page_data(
+    client: GetAffirmationsClient,
+    list_query: Annotated[
+        AffirmationsQuery,
+        Depends(get_affirmations_list_query),
+    ],
+    settings_query: Annotated[
+        AffirmationsQuery,
+        Depends(get_user_settings_query),
+    ],
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Список аффирмаций и настройки пользователя одним походом в брокер"""
+
+    async def fetch_many(
+        queries: Sequence[AffirmationsQuery],
+    ) -> list[dict[str, Any]]:
+        if settings.rabbit.batch_queries:
+            return await client.batch(*queries)
+        return await client.gather(*queries)
+
+    try:
+        affirmations, user_settings = await affirmations_cache.get_many(
+            [list_query, settings_query],
+            fetch_many,
+            client.query,
         )
-        return GetUserSettingsResponse.model_validate(
-            decoded_broker_response,
-        ).model_dump()
-    except TimeoutError as e:
+    except BROKER_ERRORS as e:
         raise RabbitMQServiceUnavailableError from e
 
+    return (
+        GetListAffirmationsResponse.model_validate(affirmations).model_dump(),
+        GetUserSettingsResponse.model_validate(user_settings).model_dump(),
+    )
+
+
+AFFIRMATIONS_COMMAND_QUEUE = "cmd.affirmations"
+
+
+async def enqueue_affirmations_command(
+    crud_service: GetCRUDService,
+    user_tg: int,
+    message: dict[str, Any],
+) -> None:
+    """
+    Записать команду в outbox и сразу вернуть управление.
+
+    В брокер команду отправит `OutboxRelay`, поэтому ответ клиенту
+    не зависит от доступности RabbitMQ. До отправки ответы пользователя
+    не кэшируются, кэш сбрасывается после подтверждения публикации.
+    """
+    affirmations_cache.hold(user_tg)
+    await crud_service.outbox.enqueue(AFFIRMATIONS_COMMAND_QUEUE, message)
+    outbox_relay.notify()
+
+
+def _on_command_published(
+    message: dict[str, Any],
+) -> None:
+    affirmations_cache.invalidate(int(message["payload"]["user_tg"]))
+
+
+outbox_relay.subscribe(AFFIRMATIONS_COMMAND_QUEUE, _on_command_published)
+
 
 async def delete_user_affirmation(
     affirmation_id: int,
-    user_id: Annotated[
-        str,
-        Depends(jwt_helper.strict_validate_access_token),
-    ],
+    user: CurrentUser,
     crud_service: GetCRUDService,
-    broker: GetRabbitBroker,
 ) -> bool:
-    try:
-        user = await crud_service.user.get_by_id_or_uuid(user_id)
-        message = {
-            "type": "RemoveAffirmation",
-            "payload": {
-                "user_tg": user.tg_id,
-                "affirmation_id": affirmation_id,
-            },
-        }
-
-        await broker.publish(
-            message,
-            queue="cmd.affirmations",
-            timeout=3,
-        )
-    except UserNotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        ) from e
-    except TimeoutError as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Service unavailable",
-        ) from e
-    else:
-        return True
+    message = {
+        "type": "RemoveAffirmation",
+        "payload": {
+            "user_tg": user.tg_id,
+            "affirmation_id": affirmation_id,
+        },
+    }
+    await enqueue_affirmations_command(crud_service, user.tg_id, message)
+    return True
 
 
 async def update_user_affirmation(
     affirmation_id: int,
-    user_id: Annotated[
-        str,
-        Depends(jwt_helper.strict_validate_access_token),
-    ],
+    user: CurrentUser,
     crud_service: GetCRUDService,
-    broker: GetRabbitBroker,
     affirmation_in: Annotated[UpdateAffirmation, Body()],
 ) -> bool:
-    try:
-        user = await crud_service.user.get_by_id_or_uuid(user_id)
-        message = {
-            "type": "UpdateAffirmation",
-            "payload": {
-                "user_tg": user.tg_id,
-                "affirmation_id": affirmation_id,
-                "affirmation_in": affirmation_in.text,
-            },
-        }
-        await broker.publish(
-            message,
-            queue="cmd.affirmations",
-            timeout=3,
-        )
-    except UserNotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        ) from e
-    except TimeoutError as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Service unavailable",
-        ) from e
-    else:
-        return True
+    message = {
+        "type": "UpdateAffirmation",
+        "payload": {
+            "user_tg": user.tg_id,
+            "affirmation_id": affirmation_id,
+            "affirmation_in": affirmation_in.text,
+        },
+    }
+    await enqueue_affirmations_command(crud_service, user.tg_id, message)
+    return True
 
 
 async def patch_user_affirmation_settings(
-    user_id: Annotated[
-        str,
-        Depends(jwt_helper.strict_validate_access_token),
-    ],
+    user: CurrentUser,
     crud_service: GetCRUDService,
-    broker: GetRabbitBroker,
     settings_in: Annotated[ChangeAffirmationsSettings, Body()],
 ) -> bool:
-    try:
-        user = await crud_service.user.get_by_id_or_uuid(user_id)
-        message = {
-            "type": "PatchAffirmationsSettings",
-            "payload": {
-                "user_tg": user.tg_id,
-                "settings_in": settings_in.model_dump(),
-            },
-        }
-        await broker.publish(
-            message,
-            queue="cmd.affirmations",
-            timeout=3,
-        )
-    except UserNotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        ) from e
-    except TimeoutError as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Service unavailable",
-        ) from e
-    else:
-        return True
+    message = {
+        "type": "PatchAffirmationsSettings",
+        "payload": {
+            "user_tg": user.tg_id,
+            "settings_in": settings_in.model_dump(),
+        },
+    }
+    await enqueue_affirmations_command(crud_service, user.tg_id, message)
+    return True
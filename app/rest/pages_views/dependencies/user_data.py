@@ -4,25 +4,23 @@ from typing import Any
 from fastapi import Depends
 from fastapi.requests import Request
 
-from auth import jwt_helper
-from core.crud import GetCRUDService
+from api.api_v2.users_views.photo_views.dependencies import get_photo_url
+from auth.current_user import CurrentUser
+from core.s3 import GetS3Service
 from rest.pages_views.schemas.user_data import UserDataReadSchema
 
 
 async def get_user_data_by_access_token(
-    crud_service: GetCRUDService,
-    user_id: str = Depends(
-        jwt_helper.strict_validate_access_token,
-    ),
+    user: CurrentUser,
+    s3_service: GetS3Service,
 ) -> UserDataReadSchema | None:
-    user = await crud_service.user.get_by_id_or_uuid(user_id)
     return UserDataReadSchema(
-        id=user_id,
+        id=user.id,
         tg_id=user.tg_id,
         first_name=user.first_name,
         last_name=user.last_name,
         username=user.username,
-        photo_url="/static/media/nonePhoto.png",
+        photo_url=get_photo_url(user.photo_keys, s3_service),
     )
 
 
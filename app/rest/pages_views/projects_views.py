@@ -15,7 +15,7 @@ from rest.pages_views.dependencies.user_data import (
     return_data_for_user_profile_template,
 )
 from rest.pages_views.redirect import redirect_to_login_page
-from schemas import ProjectReadSchema
+from schemas import ProjectPageSchema
 
 router = APIRouter(
     dependencies=[
@@ -31,8 +31,8 @@ router = APIRouter(
 )
 async def get_page_list_projects(
     request: Request,
-    projects: Annotated[
-        list[ProjectReadSchema],
+    page: Annotated[
+        ProjectPageSchema,
         Depends(get_user_projects),
     ],
     template_data: Annotated[
@@ -40,10 +40,16 @@ async def get_page_list_projects(
         Depends(return_data_for_user_profile_template),
     ],
 ) -> HTMLResponse:
-    """Страница с профилем пользователя"""
+    """
+    Страница со списком проектов пользователя.
+
+    Следующая страница открывается по `?cursor=<next_cursor>`,
+    на последней странице `next_cursor` пуст.
+    """
     context = {
         "request": request,
-        "projects": projects,
+        "projects": page.items,
+        "next_cursor": page.next_cursor,
         "user": template_data.get("user"),
     }
     return templates.TemplateResponse(
@@ -1,7 +1,9 @@
 from schemas.projects import ProjectCreateModel as ProjectCreateModel
 from schemas.projects import ProjectCreateSchema as ProjectCreateSchema
+from schemas.projects import ProjectPageSchema as ProjectPageSchema
 from schemas.projects import ProjectReadSchema as ProjectReadSchema
 from schemas.projects import ProjectSchema as ProjectSchema
+from schemas.projects import ProjectTreeSchema as ProjectTreeSchema
 from schemas.users import UserCreateSchema as UserCreateSchema
 from schemas.users import UserReadSchema as UserReadSchema
 from schemas.users import UserSchema as UserSchema
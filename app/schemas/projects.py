@@ -13,6 +13,9 @@ from pydantic_core.core_schema import ValidationInfo
 
 DESCRIPTION_MAX_LENGTH = 200
 TITLE_MAX_LENGTH = 50
+PROJECTS_PAGE_SIZE = 50
+PROJECTS_MAX_PAGE_SIZE = 200
+PROJECT_TREE_MAX_DEPTH = 32
 
 TitleString = Annotated[
     str,
@@ -42,6 +45,12 @@ class ProjectBase(BaseModel):
     def validate_title(cls, v: str) -> str:
         return v.strip()
 
+    @field_validator("description", mode="before")
+    @classmethod
+    def validate_description(cls, v: str | None) -> str:
+        # В таблице description nullable
+        return v or ""
+
 
 class ProjectCreateModel(ProjectBase):
     owner_id: int
@@ -81,6 +90,23 @@ class ProjectReadSchema(ProjectReadValidation):
     parent_id: int | None = None
 
 
+class ProjectPageSchema(BaseModel):
+    """
+    Страница проектов пользователя, `next_cursor` пуст на последней странице
+    """
+
+    items: list[ProjectReadSchema]
+    next_cursor: str | None = None
+
+
+class ProjectTreeSchema(ProjectReadSchema):
+    """
+    Проект с вложенными подпроектами
+    """
+
+    children: list["ProjectTreeSchema"] = []
+
+
 class ProjectSchema(ProjectReadValidation):
     id: int
     uuid: UUID
@@ -42,6 +42,7 @@ class UserSchema(UserBase):
     uuid: UUID
     created_at: datetime
     deleted_at: datetime | None = None
+    photo_keys: dict[str, str] | None = None
 
 
 class UserCreateModel(UserBase):